@@ -16,17 +16,38 @@ from .core.target_config import TargetConfig
 from .core.logger import DualLogger
 from .core.auth import DVWAAuthenticator
 from .core.http_client import HTTPClient
-from .modules.reflected import ReflectedXSSModule
-from .modules.stored import StoredXSSModule
-from .modules.dom_based import DOMXSSModule
 from .utils.validators import display_safety_banner, confirm_authorization, preflight_check
 from .utils.banner import get_current_tagline
 from .utils.request_recorder import BurpRequestRecorder
 
 
+if sys.version_info >= (3, 14) and not hasattr(argparse.ArgumentParser, '_get_validation_formatter'):
+    class _ArgumentParser(argparse.ArgumentParser):
+        """
+        ArgumentParser that reuses a single formatter for add_argument() checks.
+
+        Python 3.14 builds a fresh formatter (re-probing colour env vars) twice per
+        add_argument() call just to validate metavars and help strings. Newer
+        releases cache it via _get_validation_formatter(); mirror that here.
+        """
+
+        def add_argument(self, *args, **kwargs):
+            formatter = self.__dict__.get('_validation_formatter')
+            if formatter is None:
+                formatter = self._validation_formatter = self._get_formatter()
+
+            self._get_formatter = lambda: formatter
+            try:
+                return super().add_argument(*args, **kwargs)
+            finally:
+                del self._get_formatter
+else:
+    _ArgumentParser = argparse.ArgumentParser
+
+
 def parse_arguments():
     """Parse command-line arguments."""
-    parser = argparse.ArgumentParser(
+    parser = _ArgumentParser(
         description="HackBench | Educational XSS lab companion with a rotating safety banner",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
@@ -43,6 +64,9 @@ Examples:
   # Non-interactive mode (auto-approve all steps)
   python -m hackbench --mode all --no-interactive
 
+  # Scripted interactive run (answers consumed in prompt order)
+  python -m hackbench --mode reflected --answers y,y,n,y
+
   # Custom credentials
   python -m hackbench --username admin --password admin123
         """
@@ -98,6 +122,11 @@ Examples:
         help='Run in non-interactive mode (auto-approve all steps)'
     )
 
+    parser.add_argument(
+        '--answers',
+        help='Comma-separated answers (e.g. y,y,n) consumed by prompts before asking on stdin'
+    )
+
     parser.add_argument(
         '--log-dir',
         default='logs',
@@ -144,17 +173,23 @@ def main():
     request_recorder = BurpRequestRecorder(args.log_dir, logger)
 
     try:
-        logger.educational(f"\n{'='*70}")
-        logger.educational(f"HACKBENCH - {tagline}")
-        logger.educational(f"{'='*70}")
-        logger.educational(f"Target: {target.base_url}")
-        logger.educational(f"Mode: {args.mode}")
-        logger.educational(f"Interactive: {not args.no_interactive}")
-        logger.educational(f"{'='*70}\n")
+        logger.educational("\n".join([
+            f"\n{'='*70}",
+            f"HACKBENCH - {tagline}",
+            f"{'='*70}",
+            f"Target: {target.base_url}",
+            f"Mode: {args.mode}",
+            f"Interactive: {not args.no_interactive}",
+            f"{'='*70}\n",
+        ]))
 
         # Preflight checks
+        # The authenticator sends nothing until login, so it can be built
+        # up front and the reachability probe can warm its connection pool
+        auth = DVWAAuthenticator(target.base_url, logger)
+
         logger.educational("Running preflight checks...")
-        success, error = preflight_check(target, logger)
+        success, error = preflight_check(target, logger, session=auth.session)
 
         if not success:
             logger.educational(f"\n❌ Preflight check failed: {error}")
@@ -165,26 +200,29 @@ def main():
 
         # Initialize authenticator
         logger.educational("Authenticating with DVWA...")
-        auth = DVWAAuthenticator(target.base_url, logger)
 
         # Verify DVWA presence
         is_dvwa, version = auth.verify_dvwa_presence()
         if not is_dvwa:
-            logger.educational(f"\n❌ Target does not appear to be DVWA: {version}")
-            logger.educational("Please verify:")
-            logger.educational("  1. DVWA is running")
-            logger.educational("  2. Target URL is correct")
-            logger.educational(f"  3. {target.base_url}/login.php is accessible")
+            logger.educational("\n".join([
+                f"\n❌ Target does not appear to be DVWA: {version}",
+                "Please verify:",
+                "  1. DVWA is running",
+                "  2. Target URL is correct",
+                f"  3. {target.base_url}/login.php is accessible",
+            ]))
             return 1
 
         logger.educational(f"✓ DVWA detected (version: {version})")
 
         # Login
         if not auth.login(username=args.username, password=args.password):
-            logger.educational("\n❌ Authentication failed")
-            logger.educational("Please verify:")
-            logger.educational("  1. DVWA credentials are correct")
-            logger.educational("  2. DVWA setup is complete")
+            logger.educational("\n".join([
+                "\n❌ Authentication failed",
+                "Please verify:",
+                "  1. DVWA credentials are correct",
+                "  2. DVWA setup is complete",
+            ]))
             return 1
 
         # Detect and optionally set security level
@@ -208,45 +246,45 @@ def main():
 
         # Run selected modules
         interactive = not args.no_interactive
+        answers = iter(args.answers.split(",")) if args.answers else None
         modules_run = []
         modules_succeeded = []
 
         if args.mode in ['reflected', 'all']:
-            logger.educational("\n" + "="*70)
-            logger.educational("Starting Reflected XSS Module")
-            logger.educational("="*70)
-            reflected = ReflectedXSSModule(http_client, logger, target)
+            logger.educational("\n" + "="*70 + "\nStarting Reflected XSS Module\n" + "="*70)
+            from .modules.reflected import ReflectedXSSModule
+            reflected = ReflectedXSSModule(http_client, logger, target, answers=answers)
             modules_run.append('Reflected XSS')
             if reflected.run_interactive(interactive):
                 modules_succeeded.append('Reflected XSS')
 
         if args.mode in ['stored', 'all']:
-            logger.educational("\n" + "="*70)
-            logger.educational("Starting Stored XSS Module")
-            logger.educational("="*70)
-            stored = StoredXSSModule(http_client, logger, target, auth)
+            logger.educational("\n" + "="*70 + "\nStarting Stored XSS Module\n" + "="*70)
+            from .modules.stored import StoredXSSModule
+            stored = StoredXSSModule(http_client, logger, target, auth, answers=answers)
             modules_run.append('Stored XSS')
             if stored.run_interactive(interactive):
                 modules_succeeded.append('Stored XSS')
 
         if args.mode in ['dom', 'all']:
-            logger.educational("\n" + "="*70)
-            logger.educational("Starting DOM-Based XSS Module")
-            logger.educational("="*70)
-            dom = DOMXSSModule(http_client, logger, target)
+            logger.educational("\n" + "="*70 + "\nStarting DOM-Based XSS Module\n" + "="*70)
+            from .modules.dom_based import DOMXSSModule
+            dom = DOMXSSModule(http_client, logger, target, answers=answers)
             modules_run.append('DOM-Based XSS')
             if dom.run_interactive(interactive):
                 modules_succeeded.append('DOM-Based XSS')
 
         # Summary
-        logger.educational("\n" + "="*70)
-        logger.educational("SESSION SUMMARY")
-        logger.educational("="*70)
-        logger.educational(f"Modules run: {', '.join(modules_run)}")
-        logger.educational(f"Modules succeeded: {', '.join(modules_succeeded) if modules_succeeded else 'None'}")
-        logger.educational(f"\nLogs saved to: {args.log_dir}/")
-        logger.educational(f"Raw HTTP replays: {request_recorder.output_path}")
-        logger.educational("="*70)
+        logger.educational("\n".join([
+            "\n" + "="*70,
+            "SESSION SUMMARY",
+            "="*70,
+            f"Modules run: {', '.join(modules_run)}",
+            f"Modules succeeded: {', '.join(modules_succeeded) if modules_succeeded else 'None'}",
+            f"\nLogs saved to: {args.log_dir}/",
+            f"Raw HTTP replays: {request_recorder.output_path}",
+            "="*70,
+        ]))
 
         return 0
 
@@ -263,6 +301,7 @@ def main():
         return 1
 
     finally:
+        request_recorder.close()
         logger.close()
 
 
@@ -5,13 +5,43 @@ Handles login, session cookies, and CSRF token management.
 
 import re
 import requests
-from typing import Optional, Tuple
-from bs4 import BeautifulSoup
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from lxml import etree as lxml_etree, html as lxml_html
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    lxml_etree = lxml_html = None
+    _HTML_PARSER = 'html.parser'
+
+# Patterns compiled once at import; reused for every page we inspect
+_TOKEN_RE = re.compile(
+    r"""name=['"]user_token['"][^>]*value=['"]([^'"]+)['"]"""
+    r"""|value=['"]([^'"]+)['"][^>]*name=['"]user_token['"]""",
+    re.IGNORECASE,
+)
+_SEC_RE = re.compile(r'Security Level is currently:\s*(\w+)', re.IGNORECASE)
+_VER_RE = re.compile(rb'v([\d.]+)')
+
+# checkToken() pushes this message and redirects back (200 after the
+# redirect, never a 403) when a form's user_token is stale
+CSRF_REJECTED = "CSRF token is incorrect"
+
+
+def token_rejected(response: requests.Response) -> bool:
+    """Whether DVWA refused a form submission because of its user_token."""
+    return response.status_code == 403 or CSRF_REJECTED in response.text
 
 
 class DVWAAuthenticator:
     """Manages authentication and session for DVWA."""
 
+    # Static part of the login form; only credentials and the token vary
+    _LOGIN_TEMPLATE = MappingProxyType({'Login': 'Login'})
+
     def __init__(self, base_url: str, logger):
         """
         Initialize DVWA authenticator.
@@ -23,8 +53,21 @@ class DVWAAuthenticator:
         self.base_url = base_url.rstrip('/')
         self.logger = logger
         self.session = requests.Session()
+
+        # Reuse connections across the XSS modules instead of re-handshaking
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
+
         self.security_level = None
         self._logged_in = False
+        # Last user_token seen per page URL; lets us skip a GET before POSTing
+        self._csrf_cache: dict[str, str] = {}
 
     def login(self, username: str = "admin", password: str = "password") -> bool:
         """
@@ -50,14 +93,15 @@ class DVWAAuthenticator:
                 self.logger.operational(f"Failed to fetch login page: {response.status_code}", "ERROR")
                 return False
 
-            # Extract CSRF token from login form
-            csrf_token = self._extract_csrf_token(response.text)
+            # Extract CSRF token and any other hidden fields in one pass
+            csrf_token, hidden_fields = self._extract_form_fields(response.text)
 
             # Perform login
             login_data = {
+                **hidden_fields,
                 'username': username,
                 'password': password,
-                'Login': 'Login'
+                **self._LOGIN_TEMPLATE,
             }
 
             if csrf_token:
@@ -100,19 +144,20 @@ class DVWAAuthenticator:
                 self.logger.operational(f"Failed to fetch security page: {response.status_code}", "ERROR")
                 return None
 
-            # Parse the security level from the page
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Remember the form token so set_security_level can skip a GET
+            self._extract_csrf_token(response.text, security_url)
 
+            # Parse the security level from the page
             # Look for selected option in security level form
-            selected = soup.find('option', selected=True)
-            if selected:
+            selected = self._selected_option(response.text)
+            if selected is not None:
                 level = selected.get('value', '').lower()
                 self.security_level = level
                 self.logger.operational(f"Detected security level: {level}", "INFO")
                 return level
 
             # Alternative: check for radio buttons or other indicators
-            level_match = re.search(r'Security Level is currently: (\w+)', response.text, re.IGNORECASE)
+            level_match = _SEC_RE.search(response.text)
             if level_match:
                 level = level_match.group(1).lower()
                 self.security_level = level
@@ -148,21 +193,36 @@ class DVWAAuthenticator:
         try:
             security_url = f"{self.base_url}/security.php"
 
-            # Get current page to extract CSRF token
-            response = self.session.get(security_url, timeout=10)
-            csrf_token = self._extract_csrf_token(response.text)
-
-            # Submit security level change
-            data = {
-                'security': level,
-                'seclev_submit': 'Submit'
-            }
-
-            if csrf_token:
-                data['user_token'] = csrf_token
+            # Reuse the token from the last security page we saw, if any
+            csrf_token = self._csrf_cache.get(security_url)
+            cached = csrf_token is not None
+            if not cached:
+                csrf_token = self._fetch_csrf_token(security_url)
 
             self.logger.operational(f"Setting security level to: {level}", "INFO")
-            response = self.session.post(security_url, data=data, timeout=10)
+            response = self.session.post(
+                security_url, data=self._security_form(level, csrf_token), timeout=10
+            )
+
+            if cached and token_rejected(response):
+                # Stale cached token; the re-rendered form carries a fresh
+                # one (fetch the page only if it does not) and retry once
+                self.logger.operational("Cached CSRF token rejected, refetching", "DEBUG")
+                self._csrf_cache.pop(security_url, None)
+                csrf_token = (
+                    self._extract_csrf_token(response.text, security_url)
+                    or self._fetch_csrf_token(security_url)
+                )
+                response = self.session.post(
+                    security_url, data=self._security_form(level, csrf_token), timeout=10
+                )
+
+            # DVWA re-renders the form with a fresh token after the change
+            self._extract_csrf_token(response.text, security_url)
+
+            if token_rejected(response):
+                self.logger.operational("Failed to set security level: CSRF token rejected", "ERROR")
+                return False
 
             if response.status_code == 200:
                 self.security_level = level
@@ -190,23 +250,113 @@ class DVWAAuthenticator:
         try:
             response = self.session.get(url, timeout=10)
             if response.status_code == 200:
-                return self._extract_csrf_token(response.text)
+                return self._extract_csrf_token(response.text, url)
         except Exception as e:
             self.logger.operational(f"Error fetching CSRF token: {e}", "ERROR")
 
         return None
 
-    def _extract_csrf_token(self, html: str) -> Optional[str]:
+    def extract_csrf_token(self, html: str) -> Optional[str]:
+        """
+        Extract CSRF token from a page that has already been fetched.
+
+        Args:
+            html: HTML content
+
+        Returns:
+            CSRF token if found, None otherwise
+        """
+        return self._extract_csrf_token(html)
+
+    def _fetch_csrf_token(self, url: str) -> Optional[str]:
+        """GET a page and extract (and cache) its CSRF token."""
+        response = self.session.get(url, timeout=10)
+        return self._extract_csrf_token(response.text, url)
+
+    @staticmethod
+    def _security_form(level: str, csrf_token: Optional[str]) -> dict:
+        """Build the security.php form submission."""
+        data = {
+            'security': level,
+            'seclev_submit': 'Submit'
+        }
+
+        if csrf_token:
+            data['user_token'] = csrf_token
+
+        return data
+
+    def _extract_csrf_token(self, html: str, url: Optional[str] = None) -> Optional[str]:
         """
         Extract CSRF token from HTML.
 
         Args:
             html: HTML content
+            url: Optional page URL; when given, a found token is cached for it
 
         Returns:
             CSRF token if found, None otherwise
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        # DVWA renders the token as a plain hidden input, so a regex is enough;
+        # the attributes may appear in either order.
+        match = _TOKEN_RE.search(html)
+        if match:
+            token = match.group(1) or match.group(2)
+        else:
+            token = self._extract_csrf_token_bs4(html)
+
+        if token and url:
+            self._csrf_cache[url] = token
+
+        return token
+
+    def _extract_form_fields(self, html: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Extract the CSRF token and remaining hidden form fields from HTML.
+
+        Args:
+            html: HTML content
+
+        Returns:
+            Tuple of (csrf_token_or_None, other_hidden_fields)
+        """
+        if lxml_html is None or not html:
+            return self._extract_csrf_token(html), {}
+
+        try:
+            doc = lxml_html.fromstring(html)
+        except (lxml_etree.ParserError, ValueError):
+            # e.g. a whitespace-only body; the token extractor copes with those
+            return self._extract_csrf_token(html), {}
+
+        fields = {}
+        for hidden in doc.xpath("//form//input[@type='hidden']"):
+            name = hidden.get('name')
+            if name:
+                fields[name] = hidden.get('value', '')
+
+        token = fields.pop('user_token', None) or None
+        if token is None:
+            token = self._extract_csrf_token(html)
+
+        return token, fields
+
+    @staticmethod
+    def _selected_option(html: str):
+        """Return the first <option selected> element (lxml or bs4), or None."""
+        if lxml_html is not None:
+            if not html:
+                return None
+            matches = lxml_html.fromstring(html).xpath('//option[@selected]')
+            return matches[0] if matches else None
+
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, _HTML_PARSER).find('option', selected=True)
+
+    def _extract_csrf_token_bs4(self, html: str) -> Optional[str]:
+        """Defensive fallback for markup the token regex does not recognise."""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, _HTML_PARSER)
 
         # Look for user_token hidden input
         token_input = soup.find('input', {'name': 'user_token'})
@@ -237,11 +387,12 @@ class DVWAAuthenticator:
             if response.status_code != 200:
                 return False, f"HTTP {response.status_code}"
 
-            # Check for DVWA markers in the page
-            if 'Damn Vulnerable Web Application' in response.text or 'DVWA' in response.text:
-                # Try to extract version
-                version_match = re.search(r'v([\d.]+)', response.text)
-                version = version_match.group(1) if version_match else "unknown"
+            # Check for DVWA markers in the raw body; no need to decode it
+            body = response.content
+            if b'DVWA' in body or b'Damn Vulnerable Web Application' in body:
+                # The version sits in the footer; fall back to the page head
+                version_match = _VER_RE.search(body[-8192:]) or _VER_RE.search(body[:8192])
+                version = version_match.group(1).decode('ascii') if version_match else "unknown"
 
                 self.logger.operational(f"DVWA detected (version: {version})", "INFO")
                 return True, version
@@ -3,9 +3,101 @@ HTTP client wrapper with logging integration.
 Provides convenient methods for making requests with automatic logging.
 """
 
+import re
 import requests
-from typing import Optional, Dict, Any
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from urllib.parse import urlencode
+from typing import Optional, Dict, Any, Sequence, Tuple
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # BeautifulSoup remains the fallback parser
+    lxml_html = None
+
+try:
+    import cssselect  # noqa: F401  (required by lxml's cssselect())
+    _HAS_CSSSELECT = True
+except ImportError:
+    _HAS_CSSSELECT = False
+
+
+# Angle-bracket encodings checked for in reflected output; one pass each
+_HTML_ENCODE = str.maketrans({'<': '&lt;', '>': '&gt;'})
+_URL_ENCODE = str.maketrans({'<': '%3C', '>': '%3E'})
+
+
+def encoded_variants(payload: str) -> Tuple[str, str]:
+    """Return the HTML- and URL-encoded forms of a payload."""
+    return payload.translate(_HTML_ENCODE), payload.translate(_URL_ENCODE)
+
+
+@lru_cache(maxsize=64)
+def _reflection_pattern(payload: str, variants: Optional[Tuple[str, ...]] = None) -> "re.Pattern[bytes]":
+    """
+    Build one alternation matching the raw payload and its encoded variants.
+
+    Group 1 is the raw payload; the remaining groups are the encoded forms
+    (HTML- and URL-encoded unless the caller supplies its own), so a single
+    scan of the body tells us which one was reflected. The pattern works on
+    bytes so the body never has to be decoded.
+    """
+    if variants is None:
+        variants = encoded_variants(payload)
+    return re.compile(b"|".join(
+        b"(" + re.escape(variant.encode('utf-8', errors='replace')) + b")"
+        for variant in (payload, *variants)
+    ))
+
+
+def _body_text(response: requests.Response) -> str:
+    """
+    Decode a response body once and cache it on the response.
+
+    requests re-decodes (and, without a declared charset, re-runs charset
+    detection) on every ``.text`` access; the helpers below all share this copy.
+    """
+    text = getattr(response, "_hb_text", None)
+    if text is None:
+        text = response.content.decode(response.encoding or "utf-8", errors="replace")
+        response._hb_text = text
+    return text
+
+
+def _body_snippet(response: requests.Response, limit: int) -> str:
+    """
+    Return the first ``limit`` characters of a body without decoding all of it.
+
+    At most four bytes per character are decoded, which always covers
+    ``limit`` UTF-8 characters; an already-decoded body is simply sliced.
+    """
+    text = getattr(response, "_hb_text", None)
+    if text is not None:
+        return text[:limit]
+    head = response.content[:limit * 4]
+    return head.decode(response.encoding or "utf-8", errors="replace")[:limit]
+
+
+_NO_TREE = object()
+
+
+def _parse_html(response: requests.Response):
+    """
+    Parse a response body with lxml straight from bytes, or None if empty.
+
+    The declared charset (utf-8 otherwise, as in _body_text) is handed to
+    the parser so the body is never materialised as a Python str. The tree
+    is cached on the response so every helper shares a single parse.
+    """
+    tree = getattr(response, "_hb_tree", _NO_TREE)
+    if tree is _NO_TREE:
+        content = response.content
+        if content:
+            parser = lxml_html.HTMLParser(encoding=response.encoding or "utf-8")
+            tree = lxml_html.fromstring(content, parser=parser)
+        else:
+            tree = None
+        response._hb_tree = tree
+    return tree
 
 
 class HTTPClient:
@@ -24,6 +116,18 @@ class HTTPClient:
         self.logger = logger
         self.request_recorder = request_recorder
 
+        # Fill in the headers every request carries so the session dict is
+        # only ever read from on the request path; any value already set,
+        # including the User-Agent, is kept. gzip keeps DVWA pages small.
+        headers = self.session.headers
+        headers.setdefault('Accept-Encoding', 'gzip, deflate')
+        headers.setdefault('Accept', '*/*')
+        headers.setdefault('Connection', 'keep-alive')
+
+        # Responses are logged from a per-request hook rather than one on the
+        # session, which the authenticator and any other client also use
+        self._hooks = {'response': self._on_response}
+
     def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: int = 10) -> Optional[requests.Response]:
         """
         Perform GET request with logging.
@@ -52,6 +156,48 @@ class HTTPClient:
         """
         return self._send("POST", url, data=data, timeout=timeout)
 
+    def prepare(self, method: str, url: str) -> requests.PreparedRequest:
+        """
+        Prepare a request once so repeated sends skip session merging.
+
+        Args:
+            method: HTTP method
+            url: Target URL without a query string
+
+        Returns:
+            PreparedRequest carrying the session's current headers and cookies
+        """
+        return self.session.prepare_request(requests.Request(method.upper(), url, hooks=self._hooks))
+
+    def send_with_param(
+        self,
+        prepared: requests.PreparedRequest,
+        param_name: str,
+        value: str,
+        timeout: int = 10,
+    ) -> Optional[requests.Response]:
+        """
+        Send a copy of a prepared request with a single query parameter set.
+
+        Args:
+            prepared: Template from prepare()
+            param_name: Query parameter name
+            value: Query parameter value
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response object or None on failure
+        """
+        request = prepared.copy()
+        request.url = f"{prepared.url.partition('?')[0]}?{urlencode({param_name: value})}"
+
+        try:
+            return self._send_prepared(request, {param_name: value}, timeout)
+
+        except requests.exceptions.RequestException as e:
+            self.logger.operational(f"{request.method} request failed: {e}", "ERROR")
+            return None
+
     def _send(
         self,
         method: str,
@@ -60,38 +206,63 @@ class HTTPClient:
         data: Optional[Dict[str, Any]] = None,
         timeout: int = 10,
     ) -> Optional[requests.Response]:
-        """Prepare, optionally record, and send an HTTP request."""
-        try:
-            request = requests.Request(
-                method=method.upper(),
-                url=url,
-                params=params,
-                data=data,
-                headers=dict(self.session.headers),
-            )
-            prepared = self.session.prepare_request(request)
+        """Log, optionally record, and send an HTTP request."""
+        method = method.upper()
+        log_payload = params if method == "GET" else data
 
-            log_payload = params if method.upper() == "GET" else data
-            self.logger.http_request(method.upper(), prepared.url, log_payload)
-
-            if self.request_recorder:
-                self.request_recorder.record(prepared)
-
-            response = self.session.send(prepared, timeout=timeout)
-            self.logger.http_response(response.status_code, response.text[:200])
-            return response
+        try:
+            if self.request_recorder is None:
+                # Fast path: nothing needs the PreparedRequest up front
+                self.logger.http_request(method, url, log_payload)
+                return self.session.request(
+                    method, url, params=params, data=data, timeout=timeout, hooks=self._hooks,
+                )
+
+            request = self.session.prepare_request(requests.Request(
+                method, url, params=params, data=data, hooks=self._hooks,
+            ))
+            return self._send_prepared(request, log_payload, timeout)
 
         except requests.exceptions.RequestException as e:
-            self.logger.operational(f"{method.upper()} request failed: {e}", "ERROR")
+            self.logger.operational(f"{method} request failed: {e}", "ERROR")
             return None
 
-    def check_xss_reflection(self, response: requests.Response, payload: str) -> bool:
+    def _send_prepared(
+        self,
+        request: requests.PreparedRequest,
+        log_payload: Optional[Any],
+        timeout: int,
+    ) -> requests.Response:
+        """Log and record a prepared request before sending it."""
+        self.logger.http_request(request.method, request.url, log_payload)
+
+        if self.request_recorder:
+            self.request_recorder.record(request)
+
+        # Session.request() applies proxy, CA bundle and .netrc settings from
+        # the environment; send() does not, so merge them the same way
+        settings = self.session.merge_environment_settings(
+            request.url, {}, None, self.session.verify, None
+        )
+        return self.session.send(request, timeout=timeout, **settings)
+
+    def _on_response(self, response: requests.Response, *args, **kwargs):
+        """Response hook for requests sent by this client: log the response."""
+        self.logger.http_response(response.status_code, _body_snippet(response, 200))
+
+    def check_xss_reflection(
+        self,
+        response: requests.Response,
+        payload: str,
+        variants: Optional[Sequence[str]] = None,
+    ) -> bool:
         """
         Check if XSS payload appears unencoded in response.
 
         Args:
             response: HTTP response to check
             payload: Original payload string
+            variants: Precomputed encoded forms of the payload (see encoded_variants)
 
         Returns:
             True if payload appears unencoded, False otherwise
@@ -99,21 +270,20 @@ class HTTPClient:
         if not response:
             return False
 
-        # Check if exact payload appears in response
-        if payload in response.text:
-            self.logger.operational("Payload appears unencoded in response", "INFO")
-            return True
-
-        # Check for common HTML-encoded versions
-        encoded_variants = [
-            payload.replace('<', '&lt;').replace('>', '&gt;'),
-            payload.replace('<', '%3C').replace('>', '%3E'),
-        ]
-
-        for variant in encoded_variants:
-            if variant in response.text:
-                self.logger.operational("Payload appears encoded in response", "INFO")
-                return False
+        # Single pass over the body: stop at the first raw hit, but remember
+        # whether an encoded variant showed up along the way.
+        encoded_seen = False
+        if variants is not None:
+            variants = tuple(variants)
+        for match in _reflection_pattern(payload, variants).finditer(response.content):
+            if match.lastindex == 1:
+                self.logger.operational("Payload appears unencoded in response", "INFO")
+                return True
+            encoded_seen = True
+
+        if encoded_seen:
+            self.logger.operational("Payload appears encoded in response", "INFO")
+            return False
 
         self.logger.operational("Payload not found in response", "INFO")
         return False
@@ -133,7 +303,21 @@ class HTTPClient:
             return ""
 
         try:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            if lxml_html is not None and (_HAS_CSSSELECT or not selector):
+                doc = _parse_html(response)
+                if doc is None:
+                    return ""
+
+                if selector:
+                    matches = doc.cssselect(selector)
+                    if matches:
+                        return "".join(text.strip() for text in matches[0].itertext())
+                    return ""
+
+                return doc.text_content()
+
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(_body_text(response), 'html.parser')
 
             if selector:
                 element = soup.select_one(selector)
@@ -161,9 +345,28 @@ class HTTPClient:
             return {}
 
         try:
-            soup = BeautifulSoup(response.text, 'html.parser')
             inputs = {}
 
+            if lxml_html is not None:
+                doc = _parse_html(response)
+                if doc is None:
+                    return inputs
+
+                for form_input in doc.iter('input'):
+                    name = form_input.get('name')
+                    if name:
+                        inputs[name] = form_input.get('type', 'text')
+
+                for textarea in doc.iter('textarea'):
+                    name = textarea.get('name')
+                    if name:
+                        inputs[name] = 'textarea'
+
+                return inputs
+
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(_body_text(response), 'html.parser')
+
             for form_input in soup.find_all('input'):
                 name = form_input.get('name')
                 input_type = form_input.get('type', 'text')
@@ -182,6 +385,15 @@ class HTTPClient:
             self.logger.operational(f"Error extracting form inputs: {e}", "ERROR")
             return {}
 
+    def set_header(self, name: str, value: str):
+        """
+        Set a header for every subsequent request on this session.
+
+        Session headers are merged by requests itself, so no per-request copy
+        is kept on the client.
+        """
+        self.session.headers[name] = value
+
     def get_user_agent(self) -> str:
         """Return the session's configured User-Agent string."""
         return self.session.headers.get("User-Agent", "python-requests")
@@ -9,6 +9,14 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+_LEVEL_MAP = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL
+}
+
 
 class DualLogger:
     """
@@ -17,6 +25,10 @@ class DualLogger:
     2. Educational log - Human-readable learning narrative
     """
 
+    # The named loggers are process-wide, so each DualLogger replaces the
+    # handlers the previous one installed instead of stacking another set
+    _installed: tuple = ()
+
     def __init__(self, log_dir: str = "logs"):
         """
         Initialize dual logger.
@@ -42,7 +54,6 @@ class DualLogger:
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         op_handler.setFormatter(op_formatter)
-        self.operational_logger.addHandler(op_handler)
 
         # Educational logger - learning narrative
         self.educational_logger = logging.getLogger("hackbench.educational")
@@ -55,14 +66,22 @@ class DualLogger:
         edu_handler.setLevel(logging.INFO)
         edu_formatter = logging.Formatter('%(message)s')
         edu_handler.setFormatter(edu_formatter)
-        self.educational_logger.addHandler(edu_handler)
 
         # Console handler for user feedback (with proper encoding)
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         console_formatter = logging.Formatter('%(message)s')
         console_handler.setFormatter(console_formatter)
-        self.educational_logger.addHandler(console_handler)
+
+        self._attached = (
+            (self.operational_logger, op_handler),
+            (self.educational_logger, edu_handler),
+            (self.educational_logger, console_handler),
+        )
+        self._detach(DualLogger._installed)
+        for logger, handler in self._attached:
+            logger.addHandler(handler)
+        DualLogger._installed = self._attached
 
         self.educational_logger.propagate = False
         self.operational_logger.propagate = False
@@ -75,14 +94,26 @@ class DualLogger:
             message: Log message
             level: Log level (DEBUG, INFO, WARNING, ERROR)
         """
-        level_map = {
-            "DEBUG": logging.DEBUG,
-            "INFO": logging.INFO,
-            "WARNING": logging.WARNING,
-            "ERROR": logging.ERROR,
-            "CRITICAL": logging.CRITICAL
-        }
-        self.operational_logger.log(level_map.get(level, logging.INFO), message)
+        self.operational_logger.log(_LEVEL_MAP.get(level, logging.INFO), message)
+
+    def is_enabled_for(self, stream: str, level: str = "INFO") -> bool:
+        """
+        Check whether a record would be emitted, so callers can skip building it.
+
+        Args:
+            stream: "educational" or "operational"
+            level: Log level name (DEBUG, INFO, WARNING, ERROR)
+
+        Returns:
+            True if the stream currently accepts records at that level
+        """
+        target = self.educational_logger if stream == "educational" else self.operational_logger
+        return target.isEnabledFor(_LEVEL_MAP.get(level, logging.INFO))
+
+    @property
+    def educational_enabled(self) -> bool:
+        """Whether educational INFO records would currently be emitted."""
+        return self.is_enabled_for("educational")
 
     def educational(self, message: str, section: Optional[str] = None):
         """
@@ -113,17 +144,22 @@ class DualLogger:
         self.educational(f"{description}\n")
         self.operational(f"Step {step_num}: {title}", "INFO")
 
-    def explain_success(self, what_happened: str, why_it_worked: str):
+    def explain_success(self, what_happened: str, why_it_worked: str, *args):
         """
         Explain why an exploit succeeded.
 
         Args:
             what_happened: Description of what occurred
-            why_it_worked: Technical explanation
-        """
-        self.educational(f"\n✓ SUCCESS: {what_happened}")
-        self.educational(f"\nWhy it worked:")
-        self.educational(f"  {why_it_worked}\n")
+            why_it_worked: Technical explanation; a %-format string when args are given
+            *args: Values for why_it_worked, only formatted if the educational
+                stream would emit it
+        """
+        if self.educational_enabled:
+            if args:
+                why_it_worked = why_it_worked % args
+            self.educational(f"\n✓ SUCCESS: {what_happened}")
+            self.educational(f"\nWhy it worked:")
+            self.educational(f"  {why_it_worked}\n")
         self.operational(f"Exploit successful: {what_happened}", "INFO")
 
     def explain_failure(self, what_failed: str, why_it_failed: str, suggestion: Optional[str] = None):
@@ -176,18 +212,22 @@ class DualLogger:
 
         Args:
             status_code: HTTP status code
-            snippet: Optional response snippet
+            snippet: Optional response snippet (already trimmed by the caller)
         """
         self.operational(f"Response status: {status_code}", "DEBUG")
         if snippet:
-            self.operational(f"Response snippet: {snippet[:200]}", "DEBUG")
+            self.operational(f"Response snippet: {snippet}", "DEBUG")
 
     def close(self):
-        """Close all log handlers."""
-        for handler in self.operational_logger.handlers[:]:
-            handler.close()
-            self.operational_logger.removeHandler(handler)
-
-        for handler in self.educational_logger.handlers[:]:
+        """Close the log handlers this instance installed."""
+        self._detach(self._attached)
+        if DualLogger._installed is self._attached:
+            DualLogger._installed = ()
+        self._attached = ()
+
+    @staticmethod
+    def _detach(attached: tuple):
+        """Remove and close (logger, handler) pairs installed by a DualLogger."""
+        for logger, handler in attached:
+            logger.removeHandler(handler)
             handler.close()
-            self.educational_logger.removeHandler(handler)
@@ -4,19 +4,33 @@ Ensures that attacks are only performed against authorized lab environments.
 """
 
 import re
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse
 
+# RFC 1918 ranges: 10.0.0.0/8, 172.16.0.0/12, 192.168.0.0/16
+_PRIVATE_IP_RE = re.compile(r'^(10\.|172\.(1[6-9]|2[0-9]|3[0-1])\.|192\.168\.)')
+
+_ALLOWED_HOSTS = frozenset({
+    'localhost',
+    '127.0.0.1',
+    '::1',
+    '0.0.0.0'
+})
+
+
+@lru_cache(maxsize=64)
+def _is_lab_host(host: str) -> bool:
+    """Whether a host is loopback or private; pure, so cached per host string."""
+    if host in _ALLOWED_HOSTS or host.lower() in _ALLOWED_HOSTS:
+        return True
+    return _PRIVATE_IP_RE.match(host) is not None
+
 
 class TargetConfig:
     """Configuration for target DVWA instance with safety validation."""
 
-    ALLOWED_HOSTS = [
-        'localhost',
-        '127.0.0.1',
-        '::1',
-        '0.0.0.0'
-    ]
+    ALLOWED_HOSTS = _ALLOWED_HOSTS
 
     def __init__(self, host: str = "localhost", port: int = 80, use_https: bool = False):
         """
@@ -32,13 +46,12 @@ class TargetConfig:
         self.use_https = use_https
         self._confirmed = False
 
-    @property
-    def base_url(self) -> str:
-        """Get the base URL for the target."""
-        scheme = "https" if self.use_https else "http"
-        if self.port in (80, 443):
-            return f"{scheme}://{self.host}"
-        return f"{scheme}://{self.host}:{self.port}"
+        # Built once; referenced by nearly every URL the modules construct
+        scheme = "https" if use_https else "http"
+        if port in (80, 443):
+            self.base_url = f"{scheme}://{host}"
+        else:
+            self.base_url = f"{scheme}://{host}:{port}"
 
     def is_safe_target(self) -> bool:
         """
@@ -47,28 +60,9 @@ class TargetConfig:
         Returns:
             True if target is localhost or explicitly confirmed
         """
-        # Check if it's a known safe host
-        if self.host.lower() in self.ALLOWED_HOSTS:
-            return True
-
-        # Check if it's a private IP range
-        if self._is_private_ip(self.host):
-            return True
-
-        return self._confirmed
-
-    def _is_private_ip(self, host: str) -> bool:
-        """Check if host is a private IP address."""
-        private_patterns = [
-            r'^10\.',
-            r'^172\.(1[6-9]|2[0-9]|3[0-1])\.',
-            r'^192\.168\.',
-        ]
-
-        for pattern in private_patterns:
-            if re.match(pattern, host):
-                return True
-        return False
+        # Known safe host or private IP range; the host verdict is cached,
+        # while confirmation is read live so confirm_target() needs no reset
+        return _is_lab_host(self.host) or self._confirmed
 
     def confirm_target(self):
         """Explicitly confirm that this target is authorized for testing."""
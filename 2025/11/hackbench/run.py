@@ -7,13 +7,13 @@ Example: python run.py --mode reflected
 """
 
 import sys
-import os
+from pathlib import Path
 
 # Add parent directory to path so imports work
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Now import and run as a module
-import hackbench.cli as cli
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 if __name__ == '__main__':
+    # Import lazily so importing this wrapper does not pull in the whole tool
+    import hackbench.cli as cli
+
     cli.main()
@@ -7,6 +7,7 @@ Checks that all dependencies and prerequisites are met.
 Usage: python setup_check.py
 """
 
+import os
 import sys
 import importlib
 from pathlib import Path
@@ -66,15 +67,27 @@ def check_project_structure():
         "modules/stored.py",
         "modules/dom_based.py",
         "explanations/text_blocks.py",
+        "explanations/text_blocks.txt",
         "utils/validators.py",
         "cli.py",
         "__main__.py",
     ]
 
+    # List each directory once instead of stat()ing every file
+    listings = {}
+    for file_path in required_files:
+        parent = str(Path(file_path).parent)
+        if parent not in listings:
+            try:
+                with os.scandir(parent) as entries:
+                    listings[parent] = {entry.name for entry in entries}
+            except OSError:
+                listings[parent] = set()
+
     all_ok = True
     for file_path in required_files:
         path = Path(file_path)
-        if path.exists():
+        if path.name in listings[str(path.parent)]:
             print(f"  ✓ {file_path}")
         else:
             print(f"  ✗ {file_path} - MISSING")
@@ -3,17 +3,41 @@ Basic tests for XSS Lab Tool components.
 Run with: python -m pytest tests/
 """
 
+import logging
+import re
 import pytest
-from unittest.mock import Mock, MagicMock
+import requests
+from unittest.mock import Mock, MagicMock, patch
 import sys
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add the directory holding the hackbench package to path (as run.py does);
+# the attack modules use package-relative imports, so everything is imported
+# through the package rather than from core/, utils/ etc. directly
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from core.target_config import TargetConfig
-from core.logger import DualLogger
-from explanations.text_blocks import XSSExplanations
+from hackbench.core.auth import DVWAAuthenticator
+from hackbench.core.http_client import HTTPClient, _body_snippet, _body_text, _parse_html
+from hackbench.core.target_config import TargetConfig
+from hackbench.core.logger import DualLogger
+from hackbench.explanations.text_blocks import XSSExplanations
+from hackbench.utils import banner
+from hackbench.utils.request_recorder import BurpRequestRecorder
+from hackbench.utils.validators import check_target_reachability
+from hackbench.modules.dom_based import _ENCODED_EXPLOITS
+from hackbench.modules.reflected import ReflectedXSSModule
+from hackbench.modules.stored import StoredXSSModule
+
+# Reserved characters JavaScript's decodeURI() leaves percent-encoded
+_DECODE_URI_RESERVED = frozenset(";/?:@&=+$,#")
+
+
+def _decode_uri(value: str) -> str:
+    """Mirror JavaScript's decodeURI() for the ASCII escapes used in tests."""
+    def repl(match):
+        char = chr(int(match.group(1), 16))
+        return match.group(0) if char in _DECODE_URI_RESERVED else char
+    return re.sub(r"%([0-9A-Fa-f]{2})", repl, value)
 
 
 class TestTargetConfig:
@@ -82,6 +106,40 @@ class TestDualLogger:
 
         logger.close()
 
+    def test_is_enabled_for(self, tmp_path):
+        """Test stream level checks used to skip building discarded messages."""
+        logger = DualLogger(log_dir=str(tmp_path))
+
+        assert logger.is_enabled_for("educational")
+        assert logger.is_enabled_for("operational", "DEBUG")
+
+        logger.educational_logger.setLevel(logging.WARNING)
+        try:
+            assert not logger.is_enabled_for("educational")
+            assert not logger.educational_enabled
+        finally:
+            logger.educational_logger.setLevel(logging.INFO)
+            logger.close()
+
+    def test_new_instance_replaces_handlers(self, tmp_path):
+        """A second DualLogger takes over the shared loggers instead of stacking handlers."""
+        first = DualLogger(log_dir=str(tmp_path / "first"))
+        handler_count = len(first.educational_logger.handlers)
+        second = DualLogger(log_dir=str(tmp_path / "second"))
+        try:
+            assert len(second.educational_logger.handlers) == handler_count
+            second.operational("from second", "INFO")
+            first.close()
+            second.operational("after first closed", "INFO")
+        finally:
+            first.close()
+            second.close()
+
+        first_log = next((tmp_path / "first").glob("hackbench_operational_*.log")).read_text()
+        second_log = next((tmp_path / "second").glob("hackbench_operational_*.log")).read_text()
+        assert "from second" not in first_log
+        assert "from second" in second_log and "after first closed" in second_log
+
     def test_operational_logging(self, tmp_path):
         """Test operational logging."""
         logger = DualLogger(log_dir=str(tmp_path))
@@ -153,5 +211,298 @@ class TestXSSExplanations:
         assert text == ""
 
 
+class TestDOMXSSModule:
+    """Test DOM XSS exploit URL construction."""
+
+    def test_exploit_urls_survive_decode_uri(self):
+        """DVWA decodes `default` with decodeURI; printed URLs must round-trip."""
+        for payload, _, encoded in _ENCODED_EXPLOITS:
+            assert _decode_uri(encoded) == payload
+
+
+class TestDVWAAuthenticator:
+    """Test security level changes."""
+
+    SECURITY_URL = "http://localhost/security.php"
+
+    def _authenticator(self, cached_token):
+        auth = DVWAAuthenticator("http://localhost", MagicMock())
+        auth._logged_in = True
+        auth._csrf_cache[self.SECURITY_URL] = cached_token
+        auth.session = Mock()
+        return auth
+
+    def test_stale_cached_token_is_retried(self):
+        """DVWA answers a stale token with a message, not a 403; retry with the fresh one."""
+        auth = self._authenticator("stale")
+        auth.session.post.side_effect = [
+            _page("CSRF token is incorrect<input name='user_token' value='fresh'>"),
+            _page("Security level set to low<input name='user_token' value='next'>"),
+        ]
+
+        assert auth.set_security_level("low") is True
+        assert auth.session.post.call_count == 2
+        assert auth.session.post.call_args.kwargs["data"]["user_token"] == "fresh"
+        auth.session.get.assert_not_called()
+
+    def test_rejected_token_is_reported(self):
+        """A level change DVWA refused must not be reported as a success."""
+        auth = self._authenticator("stale")
+        auth.session.post.return_value = _page("CSRF token is incorrect")
+        auth.session.get.return_value = _page("<p>no form</p>")
+
+        assert auth.set_security_level("low") is False
+        assert auth.security_level is None
+
+    def test_unparseable_login_page_falls_back(self):
+        """Bodies lxml refuses fall back to the token regex instead of raising."""
+        auth = DVWAAuthenticator("http://localhost", MagicMock())
+
+        assert auth._extract_form_fields(" \n") == (None, {})
+        assert auth._extract_form_fields(
+            "<?xml version='1.0' encoding='utf-8'?><input name='user_token' value='abc'>"
+        ) == ("abc", {})
+
+
+def _page(body: str, status_code: int = 200) -> Mock:
+    """Minimal stand-in for a requests.Response carrying an HTML body."""
+    return Mock(status_code=status_code, text=body, content=body.encode(), headers={})
+
+
+def _stored_module(auth) -> tuple:
+    """Build a StoredXSSModule wired to mock HTTP and logging collaborators."""
+    http = MagicMock()
+    http.get_cookie.return_value = None
+    logger = MagicMock()
+    logger.is_enabled_for.return_value = False
+    module = StoredXSSModule(http, logger, TargetConfig(), auth)
+    return module, http
+
+
+def _posted_token(http, call_index: int):
+    """Return the user_token sent in a recorded guestbook POST, if any."""
+    return http.post.call_args_list[call_index].kwargs["data"].get("user_token")
+
+
+class TestStoredXSSModule:
+    """Test stored XSS form submission."""
+
+    def test_tokenless_form_is_fetched_once(self):
+        """Low/medium/high forms have no user_token; remember that instead of refetching."""
+        auth = Mock()
+        auth.get_csrf_token.return_value = None
+        module, http = _stored_module(auth)
+        http.post.return_value = _page("<p>ok</p>")
+        http.get.return_value = _page('<div id="guestbook_comments">filtered</div>')
+
+        for attempt, (payload, description) in enumerate(module.payloads[:2], start=1):
+            assert module._attempt_stored_payload(payload, description, attempt, False, "UA") is False
+
+        assert auth.get_csrf_token.call_count == 1
+        assert http.post.call_count == 2
+        assert _posted_token(http, 0) is None
+        assert _posted_token(http, 1) is None
+
+    def test_rotating_token_is_taken_from_rendered_page(self):
+        """Impossible level re-issues the token per render; reuse the latest one."""
+        auth = Mock()
+        auth.get_csrf_token.return_value = "tok1"
+        auth.extract_csrf_token.side_effect = lambda html: re.search(r"value='(\w+)'", html).group(1)
+        module, http = _stored_module(auth)
+        http.post.return_value = _page("<input name='user_token' value='tok2'>")
+        http.get.return_value = _page(
+            "<input name='user_token' value='tok3'><div id=\"guestbook_comments\">filtered</div>"
+        )
+
+        for attempt, (payload, description) in enumerate(module.payloads[:2], start=1):
+            assert module._attempt_stored_payload(payload, description, attempt, False, "UA") is False
+
+        assert auth.get_csrf_token.call_count == 1
+        assert http.post.call_count == 2
+        assert _posted_token(http, 0) == "tok1"
+        assert _posted_token(http, 1) == "tok3"
+
+    def test_rejected_token_is_refetched(self):
+        """DVWA's rejection message triggers one refetch and a retried POST."""
+        auth = Mock()
+        auth.get_csrf_token.return_value = "fresh"
+        auth.extract_csrf_token.return_value = None
+        module, http = _stored_module(auth)
+        module._csrf_cache[module.get_target_url()] = "stale"
+        replies = [_page("CSRF token is incorrect"), _page("<p>ok</p>")]
+        sent_tokens = []
+
+        def post(url, data):
+            sent_tokens.append(data.get("user_token"))
+            return replies.pop(0)
+
+        http.post.side_effect = post
+        http.get.return_value = _page('<div id="guestbook_comments">filtered</div>')
+
+        payload, description = module.payloads[0]
+        assert module._attempt_stored_payload(payload, description, 1, False, "UA") is False
+
+        assert sent_tokens == ["stale", "fresh"]
+
+
+class TestReachability:
+    """Test target reachability probing."""
+
+    def test_reachable_result_is_reused(self):
+        """A successful probe is cached for the next preflight."""
+        session = Mock()
+        session.get.return_value = Mock(status_code=200)
+
+        assert check_target_reachability("http://reach-cached.test", session=session) == (True, None)
+        assert check_target_reachability("http://reach-cached.test", session=session) == (True, None)
+        assert session.get.call_count == 1
+
+    def test_failure_is_not_cached(self):
+        """A target that was down is probed again rather than reported from cache."""
+        session = Mock()
+        session.get.side_effect = [requests.exceptions.ConnectionError(), Mock(status_code=200)]
+
+        is_reachable, _ = check_target_reachability("http://reach-retry.test", session=session)
+        assert is_reachable is False
+        assert check_target_reachability("http://reach-retry.test", session=session) == (True, None)
+        assert session.get.call_count == 2
+
+
+def _response(body: bytes, encoding: str = "utf-8") -> requests.Response:
+    """Build a real requests.Response around a fixed body."""
+    response = requests.models.Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = encoding
+    return response
+
+
+class TestHTTPClient:
+    """Test response inspection helpers."""
+
+    def test_reflection_raw_encoded_and_missing(self):
+        """One scan distinguishes raw, encoded and absent payloads."""
+        client = HTTPClient(requests.Session(), MagicMock())
+        payload = "<script>alert(1)</script>"
+
+        assert client.check_xss_reflection(_response(b"<pre>Hello <script>alert(1)</script></pre>"), payload)
+        assert not client.check_xss_reflection(
+            _response(b"<pre>Hello &lt;script&gt;alert(1)&lt;/script&gt;</pre>"), payload
+        )
+        client.logger.operational.assert_called_with("Payload appears encoded in response", "INFO")
+        assert not client.check_xss_reflection(_response(b"<pre>Hello</pre>"), payload)
+        client.logger.operational.assert_called_with("Payload not found in response", "INFO")
+
+    def test_raw_hit_wins_over_earlier_encoded_copy(self):
+        """An encoded echo before the raw one must not hide the raw reflection."""
+        client = HTTPClient(requests.Session(), MagicMock())
+        body = b"&lt;svg/onload=alert(1)&gt; then <svg/onload=alert(1)>"
+
+        assert client.check_xss_reflection(_response(body), "<svg/onload=alert(1)>")
+
+    def test_body_decoded_and_parsed_once(self):
+        """Decoded text and the lxml tree are cached on the response."""
+        response = _response("<p>caf\u00e9</p>".encode("utf-8"))
+
+        assert _body_text(response) == "<p>caf\u00e9</p>"
+        assert _body_text(response) is _body_text(response)
+        assert _parse_html(response) is _parse_html(response)
+        assert _parse_html(_response(b"")) is None
+
+    def test_body_snippet_decodes_prefix_only(self):
+        """Snippets match a full decode, multibyte characters included."""
+        body = ("\u00e9" * 300).encode("utf-8")
+
+        assert _body_snippet(_response(body), 200) == "\u00e9" * 200
+        assert _body_snippet(_response(b"short"), 200) == "short"
+
+    def test_failed_request_is_logged_and_recorded(self):
+        """Requests are logged with their params and recorded before they are sent."""
+        session = requests.Session()
+        recorder = Mock()
+        client = HTTPClient(session, MagicMock(), request_recorder=recorder)
+        HTTPClient(session, MagicMock())
+
+        with patch.object(session, "send", side_effect=requests.ConnectionError("down")):
+            assert client.get("http://localhost/vulnerabilities/xss_r/", params={"name": "x"}) is None
+
+        client.logger.http_request.assert_called_once_with(
+            "GET", "http://localhost/vulnerabilities/xss_r/?name=x", {"name": "x"}
+        )
+        recorder.record.assert_called_once()
+        assert session.hooks["response"] == []
+
+
+class TestReflectedXSSModule:
+    """Test the reflected payload sweep."""
+
+    def test_payload_request_carries_current_cookies(self):
+        """Cookies set after the module is built still reach the payload GETs."""
+        session = requests.Session()
+        module = ReflectedXSSModule(HTTPClient(session, MagicMock()), MagicMock(), TargetConfig())
+        session.cookies.set("security", "low")
+        reflected = _response(b"<pre>Hello <script>alert(1)</script></pre>")
+
+        with patch.object(session, "send", return_value=reflected) as send:
+            assert module.run_interactive(interactive=False) is True
+
+        assert "security=low" in send.call_args.args[0].headers["Cookie"]
+
+
+class TestBurpRequestRecorder:
+    """Test raw request capture."""
+
+    def test_entry_framing(self, tmp_path):
+        """Entries use CRLF framing, keep the query and add a missing Host header."""
+        recorder = BurpRequestRecorder(str(tmp_path))
+        prepared = requests.Request("POST", "http://localhost:8080/form?x=1", data={"k": "v"}).prepare()
+
+        recorder.record(prepared)
+        recorder.close()
+
+        raw = recorder.output_path.read_bytes()
+        assert raw.startswith(b"POST /form?x=1 HTTP/1.1\r\n")
+        assert b"\r\nContent-Type: application/x-www-form-urlencoded\r\n" in raw
+        assert raw.endswith(b"\r\nHost: localhost:8080\r\n\r\nk=v\r\n\r\n")
+
+    def test_record_after_close_is_reported(self, tmp_path):
+        """Recording on a closed recorder logs a warning instead of raising."""
+        logger = MagicMock()
+        recorder = BurpRequestRecorder(str(tmp_path), logger=logger)
+        recorder.close()
+
+        recorder.record(requests.Request("GET", "http://localhost/").prepare())
+
+        assert logger.operational.call_args.args[1] == "WARNING"
+        assert recorder.output_path.read_bytes() == b""
+
+
+class TestUserApproval:
+    """Test pre-supplied answers for non-interactive runs."""
+
+    def test_answers_consumed_before_prompting(self):
+        """Queued answers are used in order, then the prompt takes over."""
+        module = StoredXSSModule(MagicMock(), MagicMock(), TargetConfig(), Mock(), answers=["y", " N "])
+
+        with patch("builtins.input", side_effect=EOFError) as prompt:
+            assert module._get_user_approval("first?") is True
+            assert module._get_user_approval("second?") is False
+            prompt.assert_not_called()
+            assert module._get_user_approval("third?") is False
+            prompt.assert_called_once()
+
+
+class TestBanner:
+    """Test tagline rotation."""
+
+    def test_tagline_never_repeats_back_to_back(self):
+        """Consecutive picks always differ."""
+        previous = banner._pick_new_tagline()
+        for _ in range(200):
+            current = banner._pick_new_tagline()
+            assert current != previous
+            previous = current
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -5,6 +5,7 @@ ASCII art banner and tagline selection for HackBench.
 from __future__ import annotations
 
 import random
+import sys
 
 HACKBENCH_BANNER = r"""
 ██╗  ██╗ █████╗  ██████╗██╗  ██╗██████╗ ███████╗███╗   ██╗ ██████╗██╗  ██╗
@@ -28,21 +29,26 @@ TAGLINES = [
     "Proof-of-Concepts With A Syllabus.",
 ]
 
+_UNDERLINE = "═" * 86
+
 _CURRENT_TAGLINE: str | None = None
+_TAGLINE_INDEX: int | None = None
 
 
 def _pick_new_tagline() -> str:
     """Select a tagline, avoiding immediate repeats."""
-    global _CURRENT_TAGLINE
-    candidate = random.choice(TAGLINES)
-
-    if _CURRENT_TAGLINE and len(TAGLINES) > 1:
-        attempts = 0
-        while candidate == _CURRENT_TAGLINE and attempts < 5:
-            candidate = random.choice(TAGLINES)
-            attempts += 1
-
-    _CURRENT_TAGLINE = candidate
+    global _CURRENT_TAGLINE, _TAGLINE_INDEX
+    count = len(TAGLINES)
+
+    if _TAGLINE_INDEX is None or count < 2:
+        index = random.randrange(count)
+    else:
+        # Draw from the other count - 1 slots and step over the current one
+        index = random.randrange(count - 1)
+        index += index >= _TAGLINE_INDEX
+
+    _TAGLINE_INDEX = index
+    _CURRENT_TAGLINE = TAGLINES[index]
     return _CURRENT_TAGLINE
 
 
@@ -58,11 +64,7 @@ def get_current_tagline(force_refresh: bool = False) -> str:
 def display_banner() -> str:
     """Display the HackBench banner and a rotating tagline."""
     tagline = get_current_tagline(force_refresh=True)
-    print(HACKBENCH_BANNER)
-    underline = "═" * 86
-    print(underline)
-    print(f"⚡  {tagline}")
-    print(underline)
+    sys.stdout.write(f"{HACKBENCH_BANNER}\n{_UNDERLINE}\n⚡  {tagline}\n{_UNDERLINE}\n")
     return tagline
 
 LEGAL_WARNING = """
@@ -100,4 +102,4 @@ you agree that you have explicit authorization to test the target system.
 """
 def display_legal_warning():
     """Display the legal warning banner."""
-    print(LEGAL_WARNING)
+    sys.stdout.write(LEGAL_WARNING + "\n")
@@ -0,0 +1,32 @@
+"""
+Helpers for the curl replay commands the attack modules print.
+"""
+
+import shlex
+from functools import lru_cache
+from typing import Optional
+
+# Escapes newlines in curl data values so each example stays on one line
+_NL_TABLE = str.maketrans({"\n": "\\n"})
+
+
+def curl_value(value) -> str:
+    """Stringify a curl data value, escaping newlines so it stays on one line."""
+    value = str(value)
+    return value.translate(_NL_TABLE) if "\n" in value else value
+
+
+@lru_cache(maxsize=32)
+def _quoted_key(key: str) -> Optional[str]:
+    """The "key=" head of a curl argument, if it needs no shell quoting."""
+    head = f"{key}="
+    return head if shlex.quote(head) == head else None
+
+
+def curl_field(key, value) -> str:
+    """Shell-quote a key=value curl argument, reusing the cached key head."""
+    value = curl_value(value)
+    prefix = _quoted_key(key)
+    if prefix is None:
+        return shlex.quote(f"{key}={value}")
+    return prefix + shlex.quote(value)
@@ -4,12 +4,16 @@ Utility to capture raw HTTP requests for Burp Suite or other tooling.
 
 from __future__ import annotations
 
+import atexit
+import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from urllib.parse import urlparse
 
-from requests import PreparedRequest
+if TYPE_CHECKING:
+    from requests import PreparedRequest
 
 
 class BurpRequestRecorder:
@@ -18,13 +22,22 @@ class BurpRequestRecorder:
     from Burp Suite (Project options ➜ Misc ➜ Paste raw requests).
     """
 
-    def __init__(self, log_dir: str, logger: Optional[object] = None):
+    def __init__(self, log_dir: str, logger: Optional[object] = None, buffer_size: int = 1 << 16):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.output_path = Path(log_dir) / f"hackbench_burp_replay_{timestamp}.txt"
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        self.output_path.write_text("", encoding="utf-8")
         self.logger = logger
 
+        # One raw descriptor for the whole run; entries are batched as bytes and
+        # written out once the buffer passes buffer_size
+        self._fd: Optional[int] = os.open(
+            self.output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644
+        )
+        self._buf = bytearray()
+        self._buffer_size = buffer_size
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
     def record(self, prepared_request: PreparedRequest):
         """Persist a prepared request in raw HTTP format."""
         try:
@@ -34,27 +47,31 @@ class BurpRequestRecorder:
             if url_bits.query:
                 path = f"{path}?{url_bits.query}"
 
-            lines = [f"{prepared_request.method} {path} HTTP/1.1"]
-            headers = dict(prepared_request.headers)
+            # CaseInsensitiveDict answers the Host lookup directly; no copy needed
+            headers = prepared_request.headers
+            header_lines = "\r\n".join(f"{key}: {value}" for key, value in headers.items())
 
             if "Host" not in headers and url_bits.netloc:
-                headers["Host"] = url_bits.netloc
-
-            for key, value in headers.items():
-                lines.append(f"{key}: {value}")
-
-            lines.append("")
-
-            body = prepared_request.body
-            if body:
-                if isinstance(body, bytes):
-                    body = body.decode("utf-8", errors="replace")
-                lines.append(body)
-
-            entry = "\n".join(lines) + "\n\n"
-
-            with self.output_path.open("a", encoding="utf-8") as handle:
-                handle.write(entry)
+                host_line = f"Host: {url_bits.netloc}"
+                header_lines = f"{header_lines}\r\n{host_line}" if header_lines else host_line
+
+            body = prepared_request.body or ""
+            if isinstance(body, bytes):
+                body = body.decode("utf-8", errors="replace")
+
+            # Raw HTTP framing uses CRLF line endings
+            entry = (
+                f"{prepared_request.method} {path} HTTP/1.1\r\n"
+                f"{header_lines}\r\n\r\n"
+                f"{body}\r\n\r\n"
+            )
+
+            with self._lock:
+                if self._fd is None:
+                    raise ValueError("replay file is closed")
+                self._buf += entry.encode("utf-8")
+                if len(self._buf) >= self._buffer_size:
+                    self._drain()
 
         except Exception as exc:  # pragma: no cover - defensive logging
             if self.logger:
@@ -62,3 +79,26 @@ class BurpRequestRecorder:
                     f"Failed to record request for Burp export: {exc}", "WARNING"
                 )
 
+    def flush(self):
+        """Write any buffered requests to the replay file."""
+        with self._lock:
+            self._drain()
+
+    def close(self):
+        """Flush buffered requests and close the replay file."""
+        with self._lock:
+            if self._fd is None:
+                return
+            self._drain()
+            os.close(self._fd)
+            self._fd = None
+
+    def _drain(self):
+        """Write the whole buffer out; caller holds the lock."""
+        if self._fd is None:
+            raise ValueError("replay file is closed")
+        view = memoryview(self._buf)
+        while view:
+            view = view[os.write(self._fd, view):]
+        view.release()
+        self._buf.clear()
@@ -2,24 +2,87 @@
 Validation utilities for target verification and safety checks.
 """
 
-import requests
-from typing import Tuple, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Tuple, Optional
 from .banner import display_banner, display_legal_warning
 
-
-def check_target_reachability(base_url: str, timeout: int = 10) -> Tuple[bool, Optional[str]]:
+if TYPE_CHECKING:
+    import requests
+
+# Shared pooled session so repeated probes reuse the TCP/TLS connection.
+# Built on first probe so importing this module does not pull in requests.
+_SESSION: Optional["requests.Session"] = None
+_SESSION_LOCK = threading.Lock()
+
+# Recent successful probes per base URL: base_url -> (checked_at, result)
+_REACH_CACHE: OrderedDict[str, Tuple[float, Tuple[bool, Optional[str]]]] = OrderedDict()
+_REACH_TTL = 30.0
+_REACH_CACHE_SIZE = 64
+
+
+def _get_session() -> "requests.Session":
+    """Return the shared probe session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def check_target_reachability(
+    base_url: str,
+    timeout: int = 10,
+    session: Optional["requests.Session"] = None,
+) -> Tuple[bool, Optional[str]]:
     """
     Check if target URL is reachable.
 
     Args:
         base_url: Base URL to check
         timeout: Request timeout in seconds
+        session: Session to probe with; defaults to the module's pooled session
 
     Returns:
         Tuple of (is_reachable, error_message)
+
+    A reachable result is reused for a short window so repeated preflights
+    in one run do not probe the same target again; failures are never
+    cached, so a target that was just started is seen on the next check.
     """
+    now = time.monotonic()
+    cached = _REACH_CACHE.get(base_url)
+    if cached is not None and now - cached[0] < _REACH_TTL:
+        _REACH_CACHE.move_to_end(base_url)
+        return cached[1]
+
+    result = _probe_target(base_url, timeout, session or _get_session())
+    if not result[0]:
+        _REACH_CACHE.pop(base_url, None)
+        return result
+
+    _REACH_CACHE[base_url] = (now, result)
+    _REACH_CACHE.move_to_end(base_url)
+    if len(_REACH_CACHE) > _REACH_CACHE_SIZE:
+        _REACH_CACHE.popitem(last=False)
+    return result
+
+
+def _probe_target(base_url: str, timeout: int, session: "requests.Session") -> Tuple[bool, Optional[str]]:
+    """Issue the actual reachability request for check_target_reachability."""
+    import requests
+
     try:
-        response = requests.get(base_url, timeout=timeout)
+        response = session.get(base_url, timeout=timeout)
         if response.status_code == 200:
             return True, None
         else:
@@ -59,13 +122,15 @@ def confirm_authorization() -> bool:
         return False
 
 
-def preflight_check(target_config, logger) -> Tuple[bool, Optional[str]]:
+def preflight_check(target_config, logger, session: Optional["requests.Session"] = None) -> Tuple[bool, Optional[str]]:
     """
     Perform preflight checks before running any attacks.
 
     Args:
         target_config: TargetConfig instance
         logger: DualLogger instance
+        session: Optional session for the reachability probe; passing the
+            attack session leaves a warm pooled connection for later requests
 
     Returns:
         Tuple of (success, error_message)
@@ -83,7 +148,7 @@ def preflight_check(target_config, logger) -> Tuple[bool, Optional[str]]:
     logger.operational("✓ Target passes safety validation", "INFO")
 
     # Check 2: Reachability
-    is_reachable, error = check_target_reachability(target_config.base_url)
+    is_reachable, error = check_target_reachability(target_config.base_url, session=session)
     if not is_reachable:
         return False, f"Target unreachable: {error}"
 